@@ -53,6 +53,8 @@ class CheckAuthenticationMiddleware(MiddlewareMixin):
             '/api/v1/konkurs/get_grade_by_id/',
             '/api/v1/konkurs/get_notifications/',
             '/api/v1/konkurs/get_notification_by_id/',
+            '/api/v1/konkurs/mark_notifications_read/',
+            '/api/v1/konkurs/notifications/stream_ticket/',
             '/api/v1/konkurs/get_all_subscription/',
             '/api/v1/konkurs/subscription/',
             '/api/v1/konkurs/unsubscription/',
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 20:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0003_user_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='unread_notifications_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -45,12 +45,14 @@ class User(AbstractBaseUser, PermissionsMixin):
     category = models.ForeignKey('konkurs.Category', on_delete=models.CASCADE, null=True, blank=True)
     role = models.IntegerField(choices=ROLE_CHOICES, default=0)
     children_count = models.PositiveIntegerField(default=0)
+    unread_notifications_count = models.PositiveIntegerField(default=0)
 
     is_verified = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
     image = models.ImageField(upload_to='media/', null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     USERNAME_FIELD = 'phone_number'
 
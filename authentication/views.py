@@ -6,6 +6,7 @@ from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.parsers import MultiPartParser, FormParser
+from base.conditional import conditional_response
 from konkurs.serializers import PersonalInfoSerializer
 from .models import (
     User,
@@ -44,11 +45,16 @@ class RegistrationViewSet(ViewSet):
         tags=['auth']
     )
     def get_user(self, request, *args, **kwargs):
-        user = User.objects.filter(id=request.user.id).first()
-        if user is None:
-            return Response(data={'error': _('User not found')}, status=status.HTTP_404_NOT_FOUND)
-        serializer = PersonalInfoSerializer(user, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        users = User.objects.filter(id=request.user.id)
+
+        def build():
+            user = users.first()
+            if user is None:
+                return Response(data={'error': _('User not found')}, status=status.HTTP_404_NOT_FOUND)
+            serializer = PersonalInfoSerializer(user, context={'request': request})
+            return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        return conditional_response(request, build, users)
 
 
 class LoginViewSet(ViewSet):
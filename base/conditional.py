@@ -0,0 +1,51 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from base.translation import get_request_language
+
+
+def get_queryset_state(queryset):
+    # One aggregate query instead of loading and serializing the rows.
+    state = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+    return state['last_modified'], state['count']
+
+
+def get_conditional_state(request, *querysets):
+    states = [get_queryset_state(queryset) for queryset in querysets]
+    modified = [last_modified for last_modified, count in states if last_modified is not None]
+    last_modified = max(modified) if modified else None
+    parts = [f'{last_modified.isoformat() if last_modified else ""}:{count}' for last_modified, count in states]
+    parts.append(get_request_language(request))
+    etag = f'"{hashlib.md5("|".join(parts).encode()).hexdigest()[:16]}"'
+    return etag, last_modified
+
+
+def is_not_modified(request, etag, last_modified):
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        return if_none_match.strip() == '*' or etag in [tag.strip() for tag in if_none_match.split(',')]
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    if if_modified_since is not None and last_modified is not None:
+        return int(last_modified.timestamp()) <= if_modified_since
+    return False
+
+
+def conditional_response(request, build, *querysets):
+    etag, last_modified = get_conditional_state(request, *querysets)
+    headers = {'ETag': etag}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified.timestamp())
+    if is_not_modified(request, etag, last_modified):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    else:
+        response = build()
+        if response.status_code == status.HTTP_200_OK:
+            for header, value in headers.items():
+                response[header] = value
+    patch_vary_headers(response, ['Accept-Language'])
+    return response
@@ -0,0 +1,71 @@
+import asyncio
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from redis import RedisError
+from redis import asyncio as aioredis
+
+from base.redis import get_redis
+
+# Subscribers of the in-process broker, used when Redis is not reachable (local runs and tests).
+_local_subscribers = defaultdict(set)
+
+
+def publish_many(messages):
+    messages = [(channel, json.dumps(payload, cls=DjangoJSONEncoder)) for channel, payload in messages]
+    if not messages:
+        return
+    try:
+        pipeline = get_redis().pipeline(transaction=False)
+        for channel, message in messages:
+            pipeline.publish(channel, message)
+        pipeline.execute()
+    except RedisError:
+        for channel, message in messages:
+            publish_local(channel, message)
+
+
+def publish(channel, payload):
+    publish_many([(channel, payload)])
+
+
+def publish_local(channel, message):
+    for loop, queue in list(_local_subscribers[channel]):
+        loop.call_soon_threadsafe(queue.put_nowait, message)
+
+
+async def subscribe(channels, keepalive):
+    # Yields raw messages, or None when nothing arrived within `keepalive` seconds.
+    client = aioredis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=1)
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(*channels)
+    except RedisError:
+        await client.aclose()
+        async for message in subscribe_local(channels, keepalive):
+            yield message
+        return
+    try:
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=keepalive)
+            yield message['data'].decode() if message else None
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
+
+
+async def subscribe_local(channels, keepalive):
+    subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+    for channel in channels:
+        _local_subscribers[channel].add(subscriber)
+    try:
+        while True:
+            try:
+                yield await asyncio.wait_for(subscriber[1].get(), keepalive)
+            except asyncio.TimeoutError:
+                yield None
+    finally:
+        for channel in channels:
+            _local_subscribers[channel].discard(subscriber)
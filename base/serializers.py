@@ -0,0 +1,22 @@
+from rest_framework import serializers
+
+from .translation import get_request_language
+
+
+class TranslatedModelSerializer(serializers.ModelSerializer):
+    translated_fields = ()
+
+    def get_language(self):
+        # Resolved once and shared through the context by list and nested serializers.
+        context = self.context
+        if 'language' not in context:
+            context['language'] = get_request_language(context.get('request'))
+        return context['language']
+
+    def get_fields(self):
+        fields = super().get_fields()
+        lang = self.get_language()
+        for name in self.translated_fields:
+            if name in fields:
+                fields[name].source = f'{name}_{lang}'
+        return fields
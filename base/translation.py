@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils.translation import get_language
+from modeltranslation.translator import translator
+
+
+def get_request_language(request):
+    lang_options = settings.MODELTRANSLATION_LANGUAGES
+    if request is not None:
+        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
+        if lang in lang_options:
+            return lang
+    lang = get_language()
+    if lang in lang_options:
+        return lang
+    return settings.MODELTRANSLATION_DEFAULT_LANGUAGE
+
+
+def get_translated_fields(model):
+    return list(translator.get_options_for_model(model).all_fields)
+
+
+def only_language(queryset, lang, model=None, prefix=''):
+    model = model or queryset.model
+    deferred = []
+    for field in get_translated_fields(model):
+        deferred.append(f'{prefix}{field}')
+        deferred.extend(
+            f'{prefix}{field}_{other}' for other in settings.MODELTRANSLATION_LANGUAGES if other != lang
+        )
+    # MultilingualQuerySet.defer() expands "name" into every name_* column,
+    # so the plain QuerySet implementation is used to keep the requested one.
+    return QuerySet.defer(queryset, *deferred)
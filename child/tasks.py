@@ -5,6 +5,9 @@ from django.core.files import File
 from django.core.files.storage import default_storage
 
 from konkurs.models import ChildWork, Participant
+from konkurs.utils import publish_works
+from konkurs_admin.tasks import enqueue_image_derivatives
+from konkurs_admin.statistics import update_statistics
 from rest_framework.response import Response
 from rest_framework import status
 
@@ -28,4 +31,8 @@ def bulk_works_create(participant_id, file_paths):
             )
 
     ChildWork.objects.bulk_create(child_works)
+    if participant.action == 2:
+        publish_works(child_works)
+    update_statistics(creative_works=len(child_works))
+    enqueue_image_derivatives(child_works)
     return 'Success'
\ No newline at end of file
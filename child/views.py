@@ -22,6 +22,9 @@ from konkurs.models import (
     Participant,
     Competition
 )
+from konkurs.utils import publish_works
+from konkurs_admin.tasks import enqueue_image_derivatives
+from konkurs_admin.statistics import update_statistics
 from django.utils.translation import gettext_lazy as _
 from .tasks import bulk_works_create
 
@@ -261,6 +264,10 @@ class ChildWorkViewSet(ViewSet):  # *
             for file in files
         ]
         ChildWork.objects.bulk_create(child_works)
+        if participant.action == 2:
+            publish_works(child_works)
+        update_statistics(creative_works=len(child_works))
+        enqueue_image_derivatives(child_works)
 
         return Response(data={'message': _('Successfully created')}, status=status.HTTP_201_CREATED)
 
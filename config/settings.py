@@ -174,6 +174,19 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 1280)
+IMAGE_DERIVATIVE_QUALITY = 80
+
+# Read notifications older than this move to the archive table.
+NOTIFICATION_RETENTION_DAYS = env.int('NOTIFICATION_RETENTION_DAYS', default=180)
+
+# How long a participant handed out by the jury work queue stays reserved for that jury.
+JURY_LEASE_SECONDS = env.int('JURY_LEASE_SECONDS', default=900)
+# Number of juries that grade each participant; rankings use the trimmed mean of their grades.
+JURY_GRADES_PER_PARTICIPANT = env.int('JURY_GRADES_PER_PARTICIPANT', default=1)
+# Competition leaderboards in Redis are rebuilt from the database after this many seconds.
+LEADERBOARD_TTL = env.int('LEADERBOARD_TTL', default=24 * 60 * 60)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -242,6 +255,31 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'celery_tasks.tasks.check_competition_notifications',  # Full task path
         'schedule': crontab(minute='*'),  # Runs every minute
     },
+    'reconcile_site_statistics_every_night': {
+        'task': 'celery_tasks.tasks.reconcile_site_statistics',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'flush_notification_read_receipts_every_minute': {
+        'task': 'celery_tasks.tasks.flush_notification_read_receipts',
+        'schedule': crontab(minute='*'),
+    },
+    'reconcile_unread_notifications_every_night': {
+        'task': 'celery_tasks.tasks.reconcile_unread_notifications',
+        'schedule': crontab(hour=3, minute=30),
+    },
+    'archive_notifications_every_night': {
+        'task': 'celery_tasks.tasks.archive_old_notifications',
+        'schedule': crontab(hour=4, minute=0),
+    },
+}
+
+REDIS_URL = env.str("REDIS_URL", default="redis://localhost:6379/1")
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    }
 }
 
 SWAGGER_SETTINGS = {
@@ -1,4 +1,6 @@
 from django.contrib import admin
-from .models import Assessment
+from .models import Assessment, CriterionScore, ParticipantScore
 
 admin.site.register(Assessment)
+admin.site.register(CriterionScore)
+admin.site.register(ParticipantScore)
@@ -0,0 +1,188 @@
+from uuid import uuid4
+
+from django.conf import settings
+from django.db.models import Q
+from redis import RedisError
+
+from base.redis import get_redis
+from konkurs.utils import ACCEPTED
+from .models import ParticipantScore
+
+# Scores are stored negated and members zero-padded, so ZRANGE returns the database order:
+# the best trimmed mean first, ties by participant id.
+MEMBER_WIDTH = 12
+
+
+def leaderboard_key(competition_id):
+    return f'leaderboard:competition:{competition_id}'
+
+
+def empty_key(competition_id):
+    # Marks a competition without ranked participants, so its reads do not rebuild the board every time.
+    return f'{leaderboard_key(competition_id)}:empty'
+
+
+def to_member(participant_id):
+    return f'{participant_id:0{MEMBER_WIDTH}d}'
+
+
+def ranked_scores(competition_id):
+    return ParticipantScore.objects.filter(
+        competition_id=competition_id, participant__action=ACCEPTED, trimmed_mean__isnull=False,
+    )
+
+
+def build_leaderboard(competition_id, batch_size=1000):
+    key = leaderboard_key(competition_id)
+    # Every build writes its own set, so concurrent builds of one board never touch each other's data.
+    building = f'{key}:building:{uuid4().hex}'
+    redis = get_redis()
+    pipeline = redis.pipeline()
+    rows = ranked_scores(competition_id).values_list('participant_id', 'trimmed_mean')
+    mapping, ranked = {}, 0
+    for participant_id, trimmed_mean in rows.iterator(chunk_size=batch_size):
+        mapping[to_member(participant_id)] = -trimmed_mean
+        ranked += 1
+        if len(mapping) >= batch_size:
+            pipeline.zadd(building, mapping)
+            mapping = {}
+    if mapping:
+        pipeline.zadd(building, mapping)
+    pipeline.expire(building, settings.LEADERBOARD_TTL)
+    pipeline.execute()
+    pipeline = redis.pipeline()
+    if ranked:
+        # The finished set replaces the old one in a single step, so readers never see a partial board.
+        pipeline.rename(building, key)
+        pipeline.expire(key, settings.LEADERBOARD_TTL)
+        pipeline.delete(empty_key(competition_id))
+    else:
+        pipeline.delete(key)
+        pipeline.set(empty_key(competition_id), 1, ex=settings.LEADERBOARD_TTL)
+    pipeline.execute()
+
+
+def rebuild_leaderboards(competition_ids=None):
+    if competition_ids is None:
+        competition_ids = ParticipantScore.objects.filter(competition__isnull=False).values_list(
+            'competition_id', flat=True).distinct()
+    rebuilt = 0
+    for competition_id in competition_ids:
+        build_leaderboard(competition_id)
+        rebuilt += 1
+    return rebuilt
+
+
+def ensure_leaderboard(competition_id):
+    if not get_redis().exists(leaderboard_key(competition_id), empty_key(competition_id)):
+        build_leaderboard(competition_id)
+
+
+def sync_leaderboard(entries):
+    """Apply (competition_id, participant_id, trimmed_mean or None) changes to boards that are already built."""
+    entries = list(entries)
+    if not entries:
+        return
+    try:
+        redis = get_redis()
+        competition_ids = list({competition_id for competition_id, _participant_id, _score in entries})
+        pipeline = redis.pipeline(transaction=False)
+        for competition_id in competition_ids:
+            pipeline.exists(leaderboard_key(competition_id))
+            pipeline.exists(empty_key(competition_id))
+        found = pipeline.execute()
+        built = {competition_id for competition_id, filled in zip(competition_ids, found[::2]) if filled}
+        empty = {competition_id for competition_id, marked in zip(competition_ids, found[1::2]) if marked}
+        # Boards that are not built are left alone; the next read builds them from the database.
+        pipeline = redis.pipeline(transaction=False)
+        for competition_id, participant_id, trimmed_mean in entries:
+            key = leaderboard_key(competition_id)
+            if competition_id in built:
+                if trimmed_mean is None:
+                    pipeline.zrem(key, to_member(participant_id))
+                else:
+                    pipeline.zadd(key, {to_member(participant_id): -trimmed_mean})
+            elif competition_id in empty and trimmed_mean is not None:
+                # The first ranked participant turns the empty marker into a real board.
+                pipeline.zadd(key, {to_member(participant_id): -trimmed_mean})
+                pipeline.expire(key, settings.LEADERBOARD_TTL)
+                pipeline.delete(empty_key(competition_id))
+                built.add(competition_id)
+        pipeline.execute()
+    except RedisError:
+        pass
+
+
+def top_scores(scores, start, stop):
+    # Served by participant_score_rank_idx when the scores are filtered on one competition.
+    rows = scores.order_by('-trimmed_mean', 'participant_id').values_list('participant_id', 'trimmed_mean')
+    return list(rows[start:stop]), scores.count()
+
+
+def get_top(competition_id, start=0, stop=10):
+    """Returns ([(participant_id, trimmed_mean), ...], number of ranked participants) for ranks start..stop-1."""
+    try:
+        ensure_leaderboard(competition_id)
+        pipeline = get_redis().pipeline(transaction=False)
+        pipeline.zrange(leaderboard_key(competition_id), start, stop - 1, withscores=True)
+        pipeline.zcard(leaderboard_key(competition_id))
+        members, total = pipeline.execute()
+        return [(int(member), -score) for member, score in members], total
+    except RedisError:
+        return top_scores(ranked_scores(competition_id), start, stop)
+
+
+def get_rank(competition_id, participant_id):
+    """Returns (zero-based rank, trimmed_mean) of a participant, or None when it is not ranked."""
+    try:
+        ensure_leaderboard(competition_id)
+        pipeline = get_redis().pipeline(transaction=False)
+        pipeline.zrank(leaderboard_key(competition_id), to_member(participant_id))
+        pipeline.zscore(leaderboard_key(competition_id), to_member(participant_id))
+        rank, score = pipeline.execute()
+        return None if rank is None else (rank, -score)
+    except RedisError:
+        scores = ranked_scores(competition_id)
+        trimmed_mean = scores.filter(participant_id=participant_id).values_list('trimmed_mean', flat=True).first()
+        if trimmed_mean is None:
+            return None
+        rank = scores.filter(
+            Q(trimmed_mean__gt=trimmed_mean) | Q(trimmed_mean=trimmed_mean, participant_id__lt=participant_id)
+        ).count()
+        return rank, trimmed_mean
+
+
+class RankedParticipants:
+    """Accepted participants in leaderboard order, sliced lazily so Django's paginator can page through them.
+
+    The ranks come from the leaderboard, or from ``scores`` when the queryset leaves out some ranked participants.
+    """
+
+    def __init__(self, competition_id, queryset, scores=None):
+        self.competition_id = competition_id
+        self.queryset = queryset
+        self.scores = scores
+
+    def count(self):
+        return self.queryset.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        if stop is None:
+            stop = self.count()
+        if self.scores is None:
+            ranked, total = get_top(self.competition_id, start, stop)
+        else:
+            ranked, total = top_scores(self.scores, start, stop)
+        ids = [participant_id for participant_id, _trimmed_mean in ranked]
+        if stop > total:
+            # Participants without grades come after the ranked ones, in id order.
+            ungraded = self.queryset.filter(Q(score__isnull=True) | Q(score__trimmed_mean__isnull=True))
+            ids += list(ungraded.order_by('id').values_list('id', flat=True)[max(start - total, 0):stop - total])
+        participants = self.queryset.in_bulk(ids)
+        return [participants[participant_id] for participant_id in ids if participant_id in participants]
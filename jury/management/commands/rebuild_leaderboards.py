@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jury.leaderboard import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the Redis competition leaderboards from the aggregated participant scores'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--competition', type=int, action='append', help='Only rebuild these competitions')
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_leaderboards(options['competition'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rebuilt} leaderboards'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jury.utils import recount_scores
+
+
+class Command(BaseCommand):
+    help = 'Recompute the aggregated participant scores from the jury assessments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Participants recomputed per batch')
+
+    def handle(self, *args, **options):
+        counted = recount_scores(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Recomputed scores of {counted} participants'))
@@ -0,0 +1,72 @@
+# Generated by Django 5.2 on 2026-10-18 20:30
+
+import django.db.models.deletion
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def trimmed_mean(grades):
+    grades = sorted(grades)
+    if len(grades) >= 3:
+        grades = grades[1:-1]
+    return sum(grades) / len(grades)
+
+
+def compute_scores(apps, schema_editor):
+    Assessment = apps.get_model('jury', 'Assessment')
+    ParticipantScore = apps.get_model('jury', 'ParticipantScore')
+    grades = defaultdict(list)
+    competitions = {}
+    rows = Assessment.objects.filter(participant__isnull=False).values_list(
+        'participant_id', 'participant__competition_id', 'grade')
+    for participant_id, competition_id, grade in rows.iterator(chunk_size=1000):
+        grades[participant_id].append(grade)
+        competitions[participant_id] = competition_id
+    ParticipantScore.objects.bulk_create([
+        ParticipantScore(participant_id=participant_id, competition_id=competitions[participant_id],
+                         juries=len(values), mean=sum(values) / len(values), trimmed_mean=trimmed_mean(values))
+        for participant_id, values in grades.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jury', '0001_initial'),
+        ('konkurs', '0008_participant_lease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CriterionScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('score', models.PositiveIntegerField(default=0)),
+                ('assessment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='criterion_scores', to='jury.assessment')),
+                ('criteria', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='konkurs.gradecriteria')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('assessment', 'criteria'), name='unique_criterion_score')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ParticipantScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('juries', models.PositiveIntegerField(default=0)),
+                ('mean', models.FloatField(blank=True, null=True)),
+                ('trimmed_mean', models.FloatField(blank=True, null=True)),
+                ('competition', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='konkurs.competition')),
+                ('participant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='score', to='konkurs.participant')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['competition', '-trimmed_mean'], name='participant_score_rank_idx')],
+            },
+        ),
+        migrations.RunPython(compute_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-18 20:48
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def trimmed_mean(grades):
+    grades = sorted(grades)
+    if len(grades) >= 3:
+        grades = grades[1:-1]
+    return sum(grades) / len(grades)
+
+
+def remove_duplicate_assessments(apps, schema_editor):
+    # Double submits left more than one assessment per jury; the first one is kept.
+    Assessment = apps.get_model('jury', 'Assessment')
+    ParticipantScore = apps.get_model('jury', 'ParticipantScore')
+    duplicates = Assessment.objects.filter(participant__isnull=False, jury__isnull=False).values(
+        'participant_id', 'jury_id').annotate(first_id=Min('id'), total=Count('id')).filter(total__gt=1)
+    participant_ids = set()
+    for row in duplicates:
+        Assessment.objects.filter(participant_id=row['participant_id'], jury_id=row['jury_id']).exclude(
+            id=row['first_id']).delete()
+        participant_ids.add(row['participant_id'])
+    grades = defaultdict(list)
+    for participant_id, grade in Assessment.objects.filter(participant_id__in=participant_ids).values_list(
+            'participant_id', 'grade'):
+        grades[participant_id].append(grade)
+    for score in ParticipantScore.objects.filter(participant_id__in=participant_ids):
+        values = grades[score.participant_id]
+        score.juries = len(values)
+        score.mean = sum(values) / len(values)
+        score.trimmed_mean = trimmed_mean(values)
+        score.save(update_fields=['juries', 'mean', 'trimmed_mean'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jury', '0002_participant_scores'),
+        ('konkurs', '0008_participant_lease'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_assessments, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='assessment',
+            constraint=models.UniqueConstraint(fields=('participant', 'jury'), name='unique_jury_assessment'),
+        ),
+    ]
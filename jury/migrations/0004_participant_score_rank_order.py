@@ -0,0 +1,22 @@
+# Generated by Django 5.2 on 2026-10-18 21:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jury', '0003_unique_jury_assessment'),
+        ('konkurs', '0008_participant_lease'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='participantscore',
+            name='participant_score_rank_idx',
+        ),
+        migrations.AddIndex(
+            model_name='participantscore',
+            index=models.Index(fields=['competition', '-trimmed_mean', 'participant'], name='participant_score_rank_idx'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from base.model import BaseModel
-from konkurs.models import Participant, Competition
+from konkurs.models import Participant, Competition, GradeCriteria
 from authentication.models import User
 
 
@@ -11,6 +11,42 @@ class Assessment(BaseModel):
     grade = models.PositiveIntegerField(default=0)
     comment = models.TextField()
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['participant', 'jury'], name='unique_jury_assessment'),
+        ]
+
     def __str__(self):
         return f"{self.participant}"
 
+
+class CriterionScore(BaseModel):
+    assessment = models.ForeignKey(Assessment, on_delete=models.CASCADE, related_name='criterion_scores')
+    criteria = models.ForeignKey(GradeCriteria, on_delete=models.CASCADE)
+    score = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['assessment', 'criteria'], name='unique_criterion_score'),
+        ]
+
+    def __str__(self):
+        return f'{self.assessment} - {self.criteria}: {self.score}'
+
+
+class ParticipantScore(BaseModel):
+    # Aggregate of every jury's grade for a participant, kept up to date when assessments change.
+    participant = models.OneToOneField(Participant, on_delete=models.CASCADE, related_name='score')
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, blank=True, null=True)
+    juries = models.PositiveIntegerField(default=0)
+    mean = models.FloatField(blank=True, null=True)
+    trimmed_mean = models.FloatField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # Matches the ranking order, trimmed_mean DESC with ties by participant, within one competition.
+            models.Index(fields=['competition', '-trimmed_mean', 'participant'], name='participant_score_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.participant}: {self.trimmed_mean}'
@@ -1,65 +1,45 @@
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from konkurs.models import (
     Competition,
     Participant,
-    ChildWork
+    ChildWork,
+    GradeCriteria,
 )
-from .models import Assessment
-from django.conf import settings
+from base.serializers import TranslatedModelSerializer
+from .models import Assessment, CriterionScore
+from .utils import average_grade, criteria_error
 
 
-class ActiveCompetitionSerializer(serializers.ModelSerializer):
+class ActiveCompetitionSerializer(TranslatedModelSerializer):
+    translated_fields = ('name',)
+
     class Meta:
         model = Competition
         fields = ['id', 'name']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['name'] = getattr(instance, f'name_{lang}')
-        data['name'] = instance.name
-        return data
-
 
 class ParticipantSerializer(serializers.ModelSerializer):
     class Meta:
         model = Participant
-        fields = ['id', 'child']
+        fields = ['id', 'child', 'action', 'marked_status']
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        data['child'] = instance.child.first_name
+        data['child'] = instance.child.first_name if instance.child else None
         return data
 
 
-class CompetitionSerializer(serializers.ModelSerializer):
-    participants = serializers.SerializerMethodField(source='get_participants')
-    participants_number = serializers.SerializerMethodField(source='get_participants_number')
+class CompetitionSerializer(TranslatedModelSerializer):
+    translated_fields = ('name',)
+    participants_number = serializers.IntegerField(source='participants_count', read_only=True)
+    accepted_number = serializers.IntegerField(source='accepted_count', read_only=True)
+    marked_number = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Competition
-        fields = ['id', 'name', 'participants_number', 'comp_end_date', 'participants']
-
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['name'] = getattr(instance, f'name_{lang}')
-        return data
-
-    def get_participants(self, obj):
-        participants = Participant.objects.filter(competition__id=obj.id)
-        if participants:
-            return ParticipantSerializer(participants, many=True).data
-        return None
-
-    def get_participants_number(self, obj):
-        return Participant.objects.filter(competition__id=obj.id).count()
+        fields = ['id', 'name', 'participants_number', 'accepted_number', 'marked_number', 'comp_end_date']
 
 
 class WorkSerializer(serializers.ModelSerializer):
@@ -87,10 +67,51 @@ class ParticipantWorkSerializer(serializers.ModelSerializer):
         return data
 
 
+class LeasedParticipantSerializer(serializers.ModelSerializer):
+    works = WorkSerializer(source='childwork_set', many=True)
+
+    class Meta:
+        model = Participant
+        fields = ['id', 'child', 'works', 'lease_expires_at']
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['child'] = instance.child.first_name if instance.child else None
+        return data
+
+
+class CriterionScoreSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CriterionScore
+        fields = ['criteria', 'score']
+
+
 class MarkSerializer(serializers.ModelSerializer):
+    scores = CriterionScoreSerializer(source='criterion_scores', many=True, required=False)
+
     class Meta:
         model = Assessment
-        fields = ['id', 'jury', 'participant', 'grade', 'comment', 'competition']
+        fields = ['id', 'jury', 'participant', 'grade', 'comment', 'competition', 'scores']
+
+    def validate(self, attrs):
+        scores = attrs.get('criterion_scores')
+        if scores:
+            participant = attrs.get('participant')
+            required = set(GradeCriteria.objects.filter(
+                competition_id=getattr(participant, 'competition_id', None)).values_list('id', flat=True))
+            error = criteria_error([score['criteria'].id for score in scores], required)
+            if error is not None:
+                raise serializers.ValidationError({'scores': error})
+            # The jury's grade is the average of its criterion scores.
+            attrs['grade'] = average_grade([score['score'] for score in scores])
+        return attrs
+
+    def create(self, validated_data):
+        scores = validated_data.pop('criterion_scores', [])
+        with transaction.atomic():
+            assessment = super().create(validated_data)
+            CriterionScore.objects.bulk_create([CriterionScore(assessment=assessment, **score) for score in scores])
+        return assessment
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -98,6 +119,27 @@ class MarkSerializer(serializers.ModelSerializer):
         return data
 
 
+class BulkCriterionScoreSerializer(serializers.Serializer):
+    criteria = serializers.IntegerField()
+    score = serializers.IntegerField(min_value=0)
+
+
+class BulkMarkItemSerializer(serializers.Serializer):
+    participant = serializers.IntegerField()
+    grade = serializers.IntegerField(min_value=0, required=False)
+    comment = serializers.CharField()
+    scores = BulkCriterionScoreSerializer(many=True, required=False, allow_empty=False)
+
+    def validate(self, attrs):
+        if 'grade' not in attrs and 'scores' not in attrs:
+            raise serializers.ValidationError(_('grade or scores is required'))
+        return attrs
+
+
+class BulkMarkSerializer(serializers.Serializer):
+    marks = BulkMarkItemSerializer(many=True, allow_empty=False, max_length=500)
+
+
 class AssessmentHistorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Assessment
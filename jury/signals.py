@@ -1,19 +1,45 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from konkurs_admin.models import Notification
-from .models import Assessment
-from django.utils.translation import gettext_lazy  as _
+from konkurs.models import Participant
+from konkurs_admin.notifications import create_notifications
+from .leaderboard import sync_leaderboard
+from .models import Assessment, ParticipantScore
+from .utils import grade_notification, update_participant_scores
 
 
 @receiver(post_save, sender=Assessment)
 def post_save_for_winner(sender, instance, created, **kwargs):
-    message = (
-        _('Jury graded your work. You can see your feedbacks')
-    )
-    instance.participant.marked_status = 2
-    instance.participant.save()
-    Notification.objects.create(
-        user=instance.participant.child.user, child=instance.participant.child,
-        grade=instance.grade, comment=instance.comment, message=message,
-        competition=instance.participant.competition
-    )
\ No newline at end of file
+    create_notifications([grade_notification(instance, instance.participant)])
+
+
+@receiver(post_save, sender=Assessment)
+@receiver(post_delete, sender=Assessment)
+def post_change_for_score(sender, instance, **kwargs):
+    if instance.participant_id is not None:
+        update_participant_scores([instance.participant_id])
+
+
+@receiver(post_save, sender=Participant)
+def post_save_for_leaderboard(sender, instance, created, **kwargs):
+    # Accepting or rejecting a graded participant adds it to or drops it from the leaderboard.
+    previous = getattr(instance, 'previous_state', None)
+    if created or previous is None or previous == (instance.competition_id, instance.action):
+        return
+    removed = []
+    if previous[0] is not None and previous[0] != instance.competition_id:
+        removed.append((previous[0], instance.id, None))
+    if Assessment.objects.filter(participant=instance).exists():
+        update_participant_scores([instance.id])
+    elif instance.competition_id is not None:
+        # Ungraded participants get no score row; they only have to be off the board.
+        removed.append((instance.competition_id, instance.id, None))
+    if removed:
+        transaction.on_commit(lambda: sync_leaderboard(removed))
+
+
+@receiver(post_delete, sender=ParticipantScore)
+def post_delete_for_leaderboard(sender, instance, **kwargs):
+    if instance.competition_id is not None:
+        entry = (instance.competition_id, instance.participant_id, None)
+        transaction.on_commit(lambda: sync_leaderboard([entry]))
@@ -8,9 +8,14 @@ urlpatterns = [
     path('get_comp_by_id/<int:pk>/', JuryViewSet.as_view({'get': 'get_comp_by_id'}), name='get_comp_by_id'),
     path('filter_participants/<int:pk>/', JuryViewSet.as_view({'get': 'filter_participants'}),
          name='filter_participants'),
+    path('get_comp_participants/<int:pk>/', JuryViewSet.as_view({'get': 'get_comp_participants'}),
+         name='get_comp_participants'),
     path('get_participant_by_id/<int:pk>/', JuryViewSet.as_view({'get': 'get_participant_by_id'}),
          name='get_participant_by_id'),
+    path('next_participants/<int:pk>/', JuryViewSet.as_view({'post': 'next_participants'}),
+         name='next_participants'),
     path('mark/', JuryViewSet.as_view({'post': 'mark'}), name='mark'),
+    path('bulk_mark/', JuryViewSet.as_view({'post': 'bulk_mark'}), name='bulk_mark'),
     path('get_assessment_history/', JuryViewSet.as_view({'get': 'get_assessment_history'}),
          name='get_assessment_history'),
     path('get_assessment_by_id/<int:pk>/', JuryViewSet.as_view({'get': 'get_assessment_by_id'}),
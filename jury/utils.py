@@ -0,0 +1,217 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Exists, IntegerField, OuterRef, Q, Value, When
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from konkurs.models import GradeCriteria, Participant
+from konkurs.utils import ACCEPTED
+from konkurs_admin.models import Notification
+from konkurs_admin.notifications import create_notifications
+from .leaderboard import sync_leaderboard
+from .models import Assessment, CriterionScore, ParticipantScore
+
+NOT_MARKED = 1
+MARKED = 2
+
+
+def trimmed_mean(grades):
+    # With three or more juries the highest and the lowest grade are left out.
+    grades = sorted(grades)
+    if len(grades) >= 3:
+        grades = grades[1:-1]
+    return sum(grades) / len(grades) if grades else None
+
+
+def update_participant_scores(participant_ids):
+    participant_ids = set(participant_ids)
+    participants = {participant_id: (competition_id, action) for participant_id, competition_id, action in
+                    Participant.objects.filter(id__in=participant_ids).values_list('id', 'competition_id', 'action')}
+    grades = defaultdict(list)
+    for participant_id, grade in Assessment.objects.filter(participant_id__in=participants).values_list(
+            'participant_id', 'grade'):
+        grades[participant_id].append(grade)
+    scores = {score.participant_id: score for score in ParticipantScore.objects.filter(participant_id__in=participants)}
+    created, changed, ranked, marked = [], [], [], []
+    now = timezone.now()
+    for participant_id, (competition_id, action) in participants.items():
+        values = grades[participant_id]
+        fields = {
+            'competition_id': competition_id,
+            'juries': len(values),
+            'mean': sum(values) / len(values) if values else None,
+            'trimmed_mean': trimmed_mean(values),
+        }
+        ranked.append((competition_id, participant_id, fields['trimmed_mean'] if action == ACCEPTED else None))
+        if fields['juries'] >= settings.JURY_GRADES_PER_PARTICIPANT:
+            marked.append(participant_id)
+        score = scores.get(participant_id)
+        if score is None:
+            created.append(ParticipantScore(participant_id=participant_id, **fields))
+            continue
+        for name, value in fields.items():
+            setattr(score, name, value)
+        score.updated_at = now
+        changed.append(score)
+    ParticipantScore.objects.bulk_create(created, ignore_conflicts=True)
+    ParticipantScore.objects.bulk_update(changed, ['competition_id', 'juries', 'mean', 'trimmed_mean', 'updated_at'])
+    # A participant counts as marked only once every jury it needs has graded it.
+    Participant.objects.filter(id__in=marked).exclude(marked_status=MARKED).update(
+        marked_status=MARKED, updated_at=now)
+    Participant.objects.filter(id__in=participants).exclude(id__in=marked).exclude(marked_status=NOT_MARKED).update(
+        marked_status=NOT_MARKED, updated_at=now)
+    transaction.on_commit(lambda: sync_leaderboard(ranked))
+
+
+def recount_scores(batch_size=500):
+    participants = Participant.objects.filter(
+        Q(Exists(Assessment.objects.filter(participant=OuterRef('pk')))) | Q(score__isnull=False)
+    ).order_by('id').values_list('id', flat=True)
+    batch, counted = [], 0
+    for participant_id in participants.iterator(chunk_size=batch_size):
+        batch.append(participant_id)
+        if len(batch) >= batch_size:
+            update_participant_scores(batch)
+            counted += len(batch)
+            batch = []
+    update_participant_scores(batch)
+    return counted + len(batch)
+
+
+def needs_grading(jury):
+    # Participants that still lack grades and that this jury has not graded yet.
+    return (
+        Q(score__isnull=True) | Q(score__juries__lt=settings.JURY_GRADES_PER_PARTICIPANT),
+        ~Exists(Assessment.objects.filter(participant=OuterRef('pk'), jury=jury)),
+    )
+
+
+def lease_participants(jury, competition_id, size):
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=settings.JURY_LEASE_SECONDS)
+    available = Participant.objects.filter(
+        Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lte=now) | Q(leased_by=jury),
+        *needs_grading(jury),
+        competition_id=competition_id, action=ACCEPTED,
+    ).annotate(
+        # Participants this jury already holds come first, so asking again returns the same work.
+        own=Case(When(leased_by=jury, then=Value(0)), default=Value(1), output_field=IntegerField()),
+    ).order_by('own', 'id')
+    with transaction.atomic():
+        # Rows another jury is leasing right now are skipped instead of waited on.
+        ids = list(available.select_for_update(skip_locked=True, of=('self',)).values_list('id', flat=True)[:size])
+        Participant.objects.filter(id__in=ids).update(leased_by=jury, lease_expires_at=expires_at)
+    return ids, expires_at
+
+
+def is_leased_to_other(participant, jury):
+    return (participant.leased_by_id not in (None, jury.id)
+            and participant.lease_expires_at is not None and participant.lease_expires_at > timezone.now())
+
+
+def is_fully_graded(participant):
+    score = getattr(participant, 'score', None)
+    return score is not None and score.juries >= settings.JURY_GRADES_PER_PARTICIPANT
+
+
+def get_required_criteria(competition_ids):
+    required = defaultdict(set)
+    for competition_id, criteria_id in GradeCriteria.objects.filter(competition_id__in=competition_ids).values_list(
+            'competition_id', 'id'):
+        required[competition_id].add(criteria_id)
+    return required
+
+
+def criteria_error(criteria_ids, required_ids):
+    # A grade built from criterion scores must cover every criteria of the competition exactly once.
+    if len(set(criteria_ids)) != len(criteria_ids):
+        return _('Each criteria can be scored once')
+    if not set(criteria_ids) <= required_ids:
+        return _('Criteria must belong to the competition')
+    if set(criteria_ids) != required_ids:
+        return _('Every criteria of the competition must be scored')
+    return None
+
+
+def average_grade(scores):
+    return round(sum(scores) / len(scores))
+
+
+def grade_notification(assessment, participant):
+    return Notification(
+        user=participant.child.user, child=participant.child, grade=assessment.grade, comment=assessment.comment,
+        message=_('Jury graded your work. You can see your feedbacks'), competition_id=participant.competition_id,
+    )
+
+
+def bulk_mark(jury, marks):
+    """Grade many participants at once; returns one result per submitted mark, in order."""
+    ids = [mark['participant'] for mark in marks]
+    results = []
+    with transaction.atomic():
+        participants = Participant.objects.select_for_update(of=('self',)).select_related(
+            'child__user', 'score', 'competition').in_bulk(ids)
+        graded = set(Assessment.objects.filter(jury=jury, participant_id__in=ids).values_list(
+            'participant_id', flat=True))
+        required = get_required_criteria({participant.competition_id for participant in participants.values()})
+        accepted, seen = [], set()
+        for mark in marks:
+            participant = participants.get(mark['participant'])
+            error = None
+            if participant is None:
+                error = _('Participant not found')
+            elif mark['participant'] in seen:
+                error = _('Participant is listed more than once')
+            elif participant.action != ACCEPTED:
+                error = _('Participant request is not accepted')
+            elif participant.competition is None or participant.competition.status != 1:
+                error = _('Comp is not active')
+            elif participant.id in graded or is_fully_graded(participant):
+                error = _("You've already marked this participant")
+            elif is_leased_to_other(participant, jury):
+                error = _('Another jury is grading this participant')
+            elif 'scores' in mark:
+                error = criteria_error([score['criteria'] for score in mark['scores']],
+                                       required[participant.competition_id])
+            seen.add(mark['participant'])
+            if error is not None:
+                results.append({'participant': mark['participant'], 'error': error})
+                continue
+            grade = average_grade([score['score'] for score in mark['scores']]) if 'scores' in mark else mark['grade']
+            assessment = Assessment(jury=jury, participant=participant, competition_id=participant.competition_id,
+                                    grade=grade, comment=mark['comment'])
+            accepted.append((assessment, participant, mark.get('scores', [])))
+            results.append({'participant': mark['participant'], 'assessment': assessment})
+
+        # bulk_create skips the Assessment post_save receiver, so its side effects are applied here in bulk.
+        try:
+            with transaction.atomic():
+                Assessment.objects.bulk_create([assessment for assessment, _participant, _scores in accepted])
+        except IntegrityError:
+            # The same jury marked some of these participants concurrently; those marks are reported, not saved.
+            taken = set(Assessment.objects.filter(
+                jury=jury, participant_id__in=[participant.id for _assessment, participant, _scores in accepted]
+            ).values_list('participant_id', flat=True))
+            accepted = [item for item in accepted if item[1].id not in taken]
+            for result in results:
+                if 'assessment' in result and result['participant'] in taken:
+                    del result['assessment']
+                    result['error'] = _("You've already marked this participant")
+            Assessment.objects.bulk_create([assessment for assessment, _participant, _scores in accepted])
+        CriterionScore.objects.bulk_create([
+            CriterionScore(assessment=assessment, criteria_id=score['criteria'], score=score['score'])
+            for assessment, _participant, scores in accepted for score in scores
+        ])
+        accepted = [(assessment, participant) for assessment, participant, _scores in accepted]
+        Participant.objects.filter(id__in=[participant.id for _assessment, participant in accepted]).update(
+            leased_by=None, lease_expires_at=None, updated_at=timezone.now())
+        create_notifications([grade_notification(assessment, participant) for assessment, participant in accepted
+                              if participant.child and participant.child.user_id])
+        update_participant_scores(participant.id for _assessment, participant in accepted)
+    for result in results:
+        if 'assessment' in result:
+            result['assessment'] = result['assessment'].id
+    return results
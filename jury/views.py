@@ -1,8 +1,13 @@
 from rest_framework.viewsets import ViewSet
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q
 from konkurs.models import (
     Competition,
-    Participant, Category
+    Participant, Category,
+    APPROVEMENT,
+    MARKED_STATUS,
 )
+from konkurs_admin.pagination import CustomCursorPagination
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from .models import Assessment
@@ -13,10 +18,14 @@ from .serializers import (
     MarkSerializer,
     AssessmentHistorySerializer,
     ParticipantSerializer,
+    LeasedParticipantSerializer,
+    BulkMarkSerializer,
 )
+from .utils import bulk_mark, is_fully_graded, is_leased_to_other, lease_participants
 from rest_framework.response import Response
 from rest_framework import status
 from authentication.models import User
+from base.translation import get_request_language, only_language
 from django.utils.translation import gettext_lazy  as _
 
 
@@ -30,7 +39,7 @@ class JuryViewSet(ViewSet):
         tags=['jury']
     )
     def get_active_comp(self, request, *args, **kwargs):
-        comps = Competition.objects.filter(status=1)
+        comps = only_language(Competition.objects.filter(status=1), get_request_language(request))
         serializer = ActiveCompetitionSerializer(comps, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -46,7 +55,8 @@ class JuryViewSet(ViewSet):
         user = User.objects.filter(id=request.user.id).first()
         if user is None:
             return Response(data={'error': _('User not found')})
-        comps = Competition.objects.filter(status=1, category=user.category)
+        comps = only_language(Competition.objects.filter(status=1, category=user.category),
+                              get_request_language(request))
         serializer = ActiveCompetitionSerializer(comps, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -67,6 +77,7 @@ class JuryViewSet(ViewSet):
         competitions = Competition.objects.all()
         if category:
             competitions = Competition.objects.filter(category=category, status=1)
+        competitions = only_language(competitions, get_request_language(request))
         serializer = ActiveCompetitionSerializer(competitions, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -79,7 +90,8 @@ class JuryViewSet(ViewSet):
         tags=['jury']
     )
     def get_comp_by_id(self, request, *args, **kwargs):
-        comp = Competition.objects.filter(id=kwargs['pk']).first()
+        comp = only_language(Competition.objects.filter(id=kwargs['pk']), get_request_language(request)).annotate(
+            marked_number=Count('participant', filter=Q(participant__marked_status=2))).first()
         if comp is None:
             return Response(data={'error': _('Competition not found')}, status=status.HTTP_404_NOT_FOUND)
         serializer = CompetitionSerializer(comp, context={'request': request})
@@ -91,7 +103,17 @@ class JuryViewSet(ViewSet):
         manual_parameters=[
             openapi.Parameter(
                 'category', type=openapi.TYPE_STRING, description='filter_participants', in_=openapi.IN_QUERY
-            )
+            ),
+            openapi.Parameter(
+                'cursor', openapi.IN_QUERY,
+                description="Cursor from the next/previous link",
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY,
+                description="Number of items per page (e.g., ?page_size=20)",
+                type=openapi.TYPE_INTEGER
+            ),
         ],
         responses={200: ParticipantSerializer()},
         tags=['jury'],
@@ -104,9 +126,60 @@ class JuryViewSet(ViewSet):
         comp = Competition.objects.filter(id=kwargs['pk']).first()
         if comp is None:
             return Response(data={'error': _('Competition not found')}, status=status.HTTP_404_NOT_FOUND)
-        participant = Participant.objects.filter(competition=comp, competition__category=category)
-        serializer = ParticipantSerializer(participant, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        participants = Participant.objects.filter(competition=comp, competition__category=category).select_related(
+            'child')
+        paginator = CustomCursorPagination()
+        page = paginator.paginate_queryset(participants, request, view=self)
+        serializer = ParticipantSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_description="Participants of a competition, filtered by marked status and approval",
+        operation_summary="Get Competition Participants",
+        manual_parameters=[
+            openapi.Parameter(
+                'cursor', openapi.IN_QUERY,
+                description="Cursor from the next/previous link",
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY,
+                description="Number of items per page (e.g., ?page_size=20)",
+                type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'marked_status', openapi.IN_QUERY,
+                description="1 - not marked, 2 - marked",
+                type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'action', openapi.IN_QUERY,
+                description="1 - pending, 2 - accepted, 3 - rejected",
+                type=openapi.TYPE_INTEGER
+            ),
+        ],
+        responses={200: ParticipantSerializer(many=True)},
+        tags=['jury'],
+    )
+    def get_comp_participants(self, request, *args, **kwargs):
+        if not Competition.objects.filter(id=kwargs['pk']).exists():
+            return Response(data={'error': _('Competition not found')}, status=status.HTTP_404_NOT_FOUND)
+        participants = Participant.objects.filter(competition_id=kwargs['pk']).select_related('child')
+        filters = {
+            'marked_status': dict(MARKED_STATUS),
+            'action': dict(APPROVEMENT),
+        }
+        for name, choices in filters.items():
+            value = request.GET.get(name)
+            if value:
+                if not value.isdigit() or int(value) not in choices:
+                    return Response(data={'error': _('Invalid %(name)s') % {'name': name}},
+                                    status=status.HTTP_400_BAD_REQUEST)
+                participants = participants.filter(**{name: int(value)})
+        paginator = CustomCursorPagination()
+        page = paginator.paginate_queryset(participants, request, view=self)
+        serializer = ParticipantSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
     @swagger_auto_schema(
         operation_description="Get Participant By Id",
@@ -123,6 +196,32 @@ class JuryViewSet(ViewSet):
         serializer = ParticipantWorkSerializer(participant, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
+    @swagger_auto_schema(
+        operation_description="Reserve the next accepted, unmarked participants of a competition for this jury. "
+                              "Participants reserved by another jury are skipped until their lease expires.",
+        operation_summary="Next Participants To Grade",
+        manual_parameters=[
+            openapi.Parameter(
+                'size', type=openapi.TYPE_INTEGER, description='Number of participants (1-10, default 3)',
+                in_=openapi.IN_QUERY
+            )
+        ],
+        responses={200: LeasedParticipantSerializer(many=True)},
+        tags=['jury'],
+    )
+    def next_participants(self, request, *args, **kwargs):
+        size = request.GET.get('size', '3')
+        if not size.isdigit() or not 1 <= int(size) <= 10:
+            return Response(data={'error': _('size must be between 1 and 10')}, status=status.HTTP_400_BAD_REQUEST)
+        competition = Competition.objects.filter(id=kwargs['pk'], status=1).only('id').first()
+        if competition is None:
+            return Response(data={'error': _('Competition not found')}, status=status.HTTP_404_NOT_FOUND)
+        ids, expires_at = lease_participants(request.user, competition.id, int(size))
+        participants = Participant.objects.filter(id__in=ids).select_related('child').prefetch_related(
+            'childwork_set').order_by('id')
+        serializer = LeasedParticipantSerializer(participants, many=True, context={'request': request})
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
     @swagger_auto_schema(
         operation_description="Put Mak",
         operation_summary="Put Mark",
@@ -132,6 +231,17 @@ class JuryViewSet(ViewSet):
                 'participant': openapi.Schema(type=openapi.TYPE_INTEGER, description='participant'),
                 'grade': openapi.Schema(type=openapi.TYPE_INTEGER, description='grade'),
                 'comment': openapi.Schema(type=openapi.TYPE_STRING, description='comment'),
+                'scores': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    description='Per-criterion scores; when given, grade is their average',
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            'criteria': openapi.Schema(type=openapi.TYPE_INTEGER, description='criteria'),
+                            'score': openapi.Schema(type=openapi.TYPE_INTEGER, description='score'),
+                        },
+                    ),
+                ),
             },
             required=['jury', 'participant', 'grade', 'comment']
         ),
@@ -146,14 +256,52 @@ class JuryViewSet(ViewSet):
         serializer = MarkSerializer(data=request.data, context={'request': request})
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        if participant.marked_status == 2:
+        try:
+            with transaction.atomic():
+                # The row lock makes juries grading the same participant take turns, as bulk_mark does.
+                participant = Participant.objects.select_for_update(of=('self',)).select_related('score').get(
+                    id=participant.id)
+                if Assessment.objects.filter(participant=participant, jury=request.user).exists() or is_fully_graded(
+                        participant):
+                    return Response(data={'error': _("You've already marked this participant")},
+                                    status=status.HTTP_400_BAD_REQUEST)
+                if is_leased_to_other(participant, request.user):
+                    return Response(data={'error': _('Another jury is grading this participant')},
+                                    status=status.HTTP_409_CONFLICT)
+                participant.leased_by = None
+                participant.lease_expires_at = None
+                participant.save(update_fields=['leased_by', 'lease_expires_at', 'updated_at'])
+                serializer.save()
+        except IntegrityError:
+            # A double submit got past the check above; the unique constraint keeps one assessment per jury.
             return Response(data={'error': _("You've already marked this participant")},
                             status=status.HTTP_400_BAD_REQUEST)
-        participant.marked = 2
-        participant.save()
-        serializer.save()
         return Response(data=serializer.data, status=status.HTTP_201_CREATED)
 
+    @swagger_auto_schema(
+        operation_description="Grade many participants in one request. Each mark is checked on its own; "
+                              "the response lists the created assessment or the error for every mark.",
+        operation_summary="Bulk Mark",
+        request_body=BulkMarkSerializer,
+        responses={
+            200: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'created': openapi.Schema(type=openapi.TYPE_INTEGER, description='Assessments created'),
+                    'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                }
+            ),
+        },
+        tags=['jury'],
+    )
+    def bulk_mark(self, request, *args, **kwargs):
+        serializer = BulkMarkSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        results = bulk_mark(request.user, serializer.validated_data['marks'])
+        created = sum('assessment' in result for result in results)
+        return Response(data={'created': created, 'results': results}, status=status.HTTP_200_OK)
+
     @swagger_auto_schema(
         operation_description="Get Grade",
         operation_summary="Get Grade",
@@ -212,5 +360,9 @@ class JuryViewSet(ViewSet):
         if assessment.jury.id != request.user.id:
             return Response(data={'error': _('You can not change this grade')},
                             status=status.HTTP_400_BAD_REQUEST)
+        # Such grades are the average of their criterion scores, so they can not be edited on their own.
+        if 'grade' in serializer.validated_data and assessment.criterion_scores.exists():
+            return Response(data={'error': _('This grade is calculated from criterion scores')},
+                            status=status.HTTP_400_BAD_REQUEST)
         serializer.save()
         return Response(data=serializer.data, status=status.HTTP_201_CREATED)
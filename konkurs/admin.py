@@ -2,15 +2,21 @@ from django.contrib import admin
 from .models import (
     Category,
     Competition,
+    CompetitionTransition,
+    CompetitionEvent,
     Participant,
     ChildWork,
     GradeCriteria,
     ContactUs,
+    PublishedWork,
 )
 
 admin.site.register(Category)
 admin.site.register(Competition)
+admin.site.register(CompetitionTransition)
+admin.site.register(CompetitionEvent)
 admin.site.register(Participant)
 admin.site.register(ChildWork)
 admin.site.register(GradeCriteria)
 admin.site.register(ContactUs)
+admin.site.register(PublishedWork)
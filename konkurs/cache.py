@@ -0,0 +1,46 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from base.translation import get_request_language
+
+CONTENT_TIMEOUT = 60 * 60 * 24
+
+
+def get_section_version(section):
+    key = f'content_version:{section}'
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_section_version(section):
+    cache.set(f'content_version:{section}', time.time_ns(), None)
+
+
+def get_cached_section(section, request, build):
+    version = get_section_version(section)
+    key = f'content:{section}:{request.get_host()}:{get_request_language(request)}:{version}'
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, CONTENT_TIMEOUT)
+    return data, version
+
+
+def combine_versions(versions):
+    joined = ':'.join(str(version) for version in versions)
+    return hashlib.md5(joined.encode()).hexdigest()[:16]
+
+
+def versioned_response(request, data, version):
+    etag = f'"{version}-{get_request_language(request)}"'
+    headers = {'ETag': etag, 'X-Content-Version': str(version)}
+    if etag in request.headers.get('If-None-Match', ''):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(data=data, status=status.HTTP_200_OK, headers=headers)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from konkurs.utils import recount_participants
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized participant counters on competitions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows fetched and updated per batch')
+
+    def handle(self, *args, **options):
+        fixed = recount_participants(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Fixed participant counters on {fixed} competitions'))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2 on 2026-10-18 20:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def publish_accepted_works(apps, schema_editor):
+    ChildWork = apps.get_model('konkurs', 'ChildWork')
+    PublishedWork = apps.get_model('konkurs', 'PublishedWork')
+    works = ChildWork.objects.filter(
+        participant__action=2, competition__isnull=False
+    ).select_related('competition').iterator(chunk_size=1000)
+    batch = []
+    for work in works:
+        batch.append(PublishedWork(
+            child_work_id=work.id,
+            participant_id=work.participant_id,
+            competition_id=work.competition_id,
+            category_id=work.competition.category_id,
+            files=work.files.name,
+        ))
+        if len(batch) >= 1000:
+            PublishedWork.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    PublishedWork.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('konkurs', '0002_participant_is_paid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublishedWork',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('files', models.FileField(blank=True, upload_to='media/')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='konkurs.category')),
+                ('child_work', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='published', to='konkurs.childwork')),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='konkurs.competition')),
+                ('participant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='konkurs.participant')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['competition', '-id'], name='konkurs_pub_competi_ed88b0_idx'), models.Index(fields=['category', '-id'], name='konkurs_pub_categor_562499_idx')],
+            },
+        ),
+        migrations.RunPython(publish_accepted_works, migrations.RunPython.noop),
+    ]
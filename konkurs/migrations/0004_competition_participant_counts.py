@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 20:09
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def count_participants(apps, schema_editor):
+    Competition = apps.get_model('konkurs', 'Competition')
+    competitions = Competition.objects.annotate(
+        actual_participants=Count('participant'),
+        actual_accepted=Count('participant', filter=Q(participant__action=2)),
+    )
+    for competition in competitions.iterator():
+        competition.participants_count = competition.actual_participants
+        competition.accepted_count = competition.actual_accepted
+        competition.save(update_fields=['participants_count', 'accepted_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('konkurs', '0003_publishedwork'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='competition',
+            name='accepted_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='competition',
+            name='participants_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_participants, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+from django.db import migrations
+
+# The statements are frozen here so later changes to konkurs.search cannot change what this migration does.
+NAMES = (
+    "coalesce(name, '') || ' ' || coalesce(name_uz, '') || ' ' || coalesce(name_ru, '') || ' ' || "
+    "coalesce(name_en, '')"
+)
+DESCRIPTIONS = (
+    "coalesce(description, '') || ' ' || coalesce(description_uz, '') || ' ' || coalesce(description_ru, '') "
+    "|| ' ' || coalesce(description_en, '')"
+)
+
+FORWARD_SQL = {
+    'postgresql': [
+        'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+        f"""
+        ALTER TABLE konkurs_competition ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', {NAMES}), 'A') ||
+            setweight(to_tsvector('simple', {DESCRIPTIONS}), 'B')
+        ) STORED
+        """,
+        'CREATE INDEX konkurs_competition_search_idx ON konkurs_competition USING GIN (search_vector)',
+        f'CREATE INDEX konkurs_competition_name_trgm_idx ON konkurs_competition USING GIN (({NAMES}) gin_trgm_ops)',
+    ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE konkurs_competition_fts USING fts5("
+        "names, descriptions, tokenize='unicode61 remove_diacritics 2')",
+        f'INSERT INTO konkurs_competition_fts (rowid, names, descriptions) '
+        f'SELECT id, {NAMES}, {DESCRIPTIONS} FROM konkurs_competition',
+        f"""
+        CREATE TRIGGER konkurs_competition_fts_insert AFTER INSERT ON konkurs_competition BEGIN
+            INSERT INTO konkurs_competition_fts (rowid, names, descriptions)
+            SELECT new.id, {NAMES}, {DESCRIPTIONS} FROM konkurs_competition WHERE id = new.id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER konkurs_competition_fts_update AFTER UPDATE ON konkurs_competition BEGIN
+            DELETE FROM konkurs_competition_fts WHERE rowid = old.id;
+            INSERT INTO konkurs_competition_fts (rowid, names, descriptions)
+            SELECT new.id, {NAMES}, {DESCRIPTIONS} FROM konkurs_competition WHERE id = new.id;
+        END
+        """,
+        """
+        CREATE TRIGGER konkurs_competition_fts_delete AFTER DELETE ON konkurs_competition BEGIN
+            DELETE FROM konkurs_competition_fts WHERE rowid = old.id;
+        END
+        """,
+    ],
+}
+
+BACKWARD_SQL = {
+    'postgresql': [
+        'DROP INDEX IF EXISTS konkurs_competition_name_trgm_idx',
+        'DROP INDEX IF EXISTS konkurs_competition_search_idx',
+        'ALTER TABLE konkurs_competition DROP COLUMN IF EXISTS search_vector',
+    ],
+    'sqlite': [
+        'DROP TRIGGER IF EXISTS konkurs_competition_fts_delete',
+        'DROP TRIGGER IF EXISTS konkurs_competition_fts_update',
+        'DROP TRIGGER IF EXISTS konkurs_competition_fts_insert',
+        'DROP TABLE IF EXISTS konkurs_competition_fts',
+    ],
+}
+
+
+def forwards(apps, schema_editor):
+    for statement in FORWARD_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def backwards(apps, schema_editor):
+    for statement in BACKWARD_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('konkurs', '0004_competition_participant_counts'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
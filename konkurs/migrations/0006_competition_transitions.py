@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-18 20:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def record_current_statuses(apps, schema_editor):
+    # Existing competitions already announced their current status; only later transitions should notify.
+    Competition = apps.get_model('konkurs', 'Competition')
+    CompetitionTransition = apps.get_model('konkurs', 'CompetitionTransition')
+    transitions = []
+    for competition_id, status in Competition.objects.filter(status__gte=1).values_list('id', 'status').iterator():
+        transitions += [CompetitionTransition(competition_id=competition_id, status=value)
+                        for value in range(1, status + 1)]
+    CompetitionTransition.objects.bulk_create(transitions, batch_size=1000)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('konkurs', '0005_competition_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompetitionTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.IntegerField(choices=[(0, '---'), (1, 'Active'), (2, 'Finished')])),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions', to='konkurs.competition')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('competition', 'status'), name='unique_competition_transition')],
+            },
+        ),
+        migrations.RunPython(record_current_statuses, migrations.RunPython.noop),
+    ]
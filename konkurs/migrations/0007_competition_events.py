@@ -0,0 +1,58 @@
+# Generated by Django 5.2 on 2026-10-18 20:20
+
+import django.db.models.deletion
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# event_type: (date field, time field, days before), as scheduled when this migration was written.
+EVENT_SCHEDULE = {
+    1: ('application_start_date', 'application_start_time', 3),
+    2: ('application_start_date', 'application_start_time', 0),
+    3: ('application_end_date', 'application_end_time', 3),
+    4: ('application_end_date', 'application_end_time', 0),
+    5: ('comp_start_date', 'comp_start_time', 3),
+    6: ('comp_end_date', 'comp_end_time', 3),
+}
+
+
+def schedule_events(apps, schema_editor):
+    Competition = apps.get_model('konkurs', 'Competition')
+    CompetitionEvent = apps.get_model('konkurs', 'CompetitionEvent')
+    now = timezone.now()
+    events = []
+    for competition in Competition.objects.iterator():
+        for event_type, (date_field, time_field, days_before) in EVENT_SCHEDULE.items():
+            fire_at = datetime.combine(getattr(competition, date_field), getattr(competition, time_field))
+            fire_at -= timedelta(days=days_before)
+            events.append(CompetitionEvent(competition=competition, event_type=event_type,
+                                           fire_at=fire_at, fired=fire_at <= now))
+    CompetitionEvent.objects.bulk_create(events, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('konkurs', '0006_competition_transitions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompetitionEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event_type', models.IntegerField(choices=[(1, 'Registration starts in 3 days'), (2, 'Registration started'), (3, 'Registration ends in 3 days'), (4, 'Registration ended'), (5, 'Competition starts in 3 days'), (6, 'Competition ends in 3 days')])),
+                ('fire_at', models.DateTimeField()),
+                ('fired', models.BooleanField(default=False)),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='konkurs.competition')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('fired', False)), fields=['fire_at'], name='competition_event_due_idx')],
+                'constraints': [models.UniqueConstraint(fields=('competition', 'event_type'), name='unique_competition_event')],
+            },
+        ),
+        migrations.RunPython(schedule_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 20:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('child', '0001_initial'),
+        ('konkurs', '0007_competition_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='participant',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='participant',
+            name='leased_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='leased_participants', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['competition', 'marked_status', 'action'], name='konkurs_par_competi_1d8e6c_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.conf import settings
 from base.model import BaseModel
 from child.models import Child
 
@@ -15,6 +16,22 @@ APPROVEMENT = (
     (3, 'Rejected'),
 )
 
+REGISTRATION_STARTS_SOON = 1
+REGISTRATION_STARTED = 2
+REGISTRATION_ENDS_SOON = 3
+REGISTRATION_ENDED = 4
+COMPETITION_STARTS_SOON = 5
+COMPETITION_ENDS_SOON = 6
+
+EVENT_TYPES = (
+    (REGISTRATION_STARTS_SOON, 'Registration starts in 3 days'),
+    (REGISTRATION_STARTED, 'Registration started'),
+    (REGISTRATION_ENDS_SOON, 'Registration ends in 3 days'),
+    (REGISTRATION_ENDED, 'Registration ended'),
+    (COMPETITION_STARTS_SOON, 'Competition starts in 3 days'),
+    (COMPETITION_ENDS_SOON, 'Competition ends in 3 days'),
+)
+
 MARKED_STATUS = (
     (1, 'Not Marked'),
     (2, 'Marked')
@@ -46,11 +63,57 @@ class Competition(BaseModel):
     physical_certificate = models.ImageField(upload_to='media/', blank=True)
     image = models.ImageField(upload_to='media/', blank=True)
     status = models.IntegerField(choices=STATUS, default=1)
+    participants_count = models.PositiveIntegerField(default=0)
+    accepted_count = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Signal handlers compare against this to tell real status transitions from ordinary edits.
+        instance.previous_status = None if 'status' in instance.get_deferred_fields() else instance.status
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.previous_status = self.status
 
     def __str__(self):
         return f'{self.name}'
 
 
+class CompetitionTransition(BaseModel):
+    # Ledger of status transitions whose side effects already ran, so each one fires once.
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name='transitions')
+    status = models.IntegerField(choices=STATUS)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['competition', 'status'], name='unique_competition_transition'),
+        ]
+
+    def __str__(self):
+        return f'{self.competition} -> {self.get_status_display()}'
+
+
+class CompetitionEvent(BaseModel):
+    # Precomputed reminder times, so the scheduler only reads the events that are due.
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name='events')
+    event_type = models.IntegerField(choices=EVENT_TYPES)
+    fire_at = models.DateTimeField()
+    fired = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['competition', 'event_type'], name='unique_competition_event'),
+        ]
+        indexes = [
+            models.Index(fields=['fire_at'], condition=models.Q(fired=False), name='competition_event_due_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.competition} - {self.get_event_type_display()}'
+
+
 class GradeCriteria(BaseModel):
     competition = models.ForeignKey(Competition, on_delete=models.CASCADE, blank=True, null=True)
     criteria = models.CharField(max_length=250)
@@ -67,6 +130,15 @@ class Participant(BaseModel):
     marked_status = models.IntegerField(choices=MARKED_STATUS, default=1)
     winner = models.BooleanField(default=False)
     is_paid = models.BooleanField(default=False)
+    # Jury work queue: the participant is reserved for leased_by until lease_expires_at.
+    leased_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True,
+                                  related_name='leased_participants')
+    lease_expires_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['competition', 'marked_status', 'action']),
+        ]
 
     def __str__(self):
         return f"{self.child}"
@@ -87,3 +159,20 @@ class ContactUs(BaseModel):
 
     def __str__(self):
         return f'{self.email}'
+
+
+class PublishedWork(BaseModel):
+    child_work = models.OneToOneField(ChildWork, on_delete=models.CASCADE, related_name='published')
+    participant = models.ForeignKey(Participant, on_delete=models.CASCADE)
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    files = models.FileField(upload_to='media/', blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['competition', '-id']),
+            models.Index(fields=['category', '-id']),
+        ]
+
+    def __str__(self):
+        return f"{self.participant}"
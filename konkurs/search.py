@@ -0,0 +1,83 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'konkurs_competition_fts'
+
+TABLE = 'konkurs_competition'
+NAME_COLUMNS = ['name'] + [f'name_{lang}' for lang in settings.MODELTRANSLATION_LANGUAGES]
+DESCRIPTION_COLUMNS = ['description'] + [f'description_{lang}' for lang in settings.MODELTRANSLATION_LANGUAGES]
+
+
+def concat_columns(columns, table=None):
+    prefix = f'{table}.' if table else ''
+    return " || ' ' || ".join(f"coalesce({prefix}{column}, '')" for column in columns)
+
+
+# Queries qualify the columns because competitions are often joined with categories, which have names too.
+QUALIFIED_NAMES_SQL = concat_columns(NAME_COLUMNS, TABLE)
+
+
+def like_pattern(search):
+    # Wildcards typed by the user are matched literally.
+    escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def fts_query(search):
+    # Every word must match as a prefix; quoting keeps user input out of the FTS5 query syntax.
+    words = re.findall(r'\w+', search)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_postgres(queryset, search):
+    matches = RawSQL(
+        f"{TABLE}.search_vector @@ websearch_to_tsquery('simple', %s) OR ({QUALIFIED_NAMES_SQL}) ILIKE %s",
+        [search, like_pattern(search)],
+        output_field=BooleanField(),
+    )
+    rank = RawSQL(
+        f"ts_rank_cd({TABLE}.search_vector, websearch_to_tsquery('simple', %s)) "
+        f"+ word_similarity(%s, {QUALIFIED_NAMES_SQL})",
+        [search, search],
+        output_field=FloatField(),
+    )
+    return queryset.filter(matches).annotate(search_rank=rank).order_by('-search_rank', '-id')
+
+
+def search_sqlite(queryset, search):
+    query = fts_query(search)
+    if not query:
+        return queryset.none()
+    matches = RawSQL(f'{TABLE}.id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)', [query],
+                     output_field=BooleanField())
+    # bm25() is lower for better matches; names weigh more than descriptions.
+    rank = RawSQL(
+        f'(SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND rowid = {TABLE}.id)',
+        [query],
+        output_field=FloatField(),
+    )
+    return queryset.filter(matches).annotate(search_rank=rank).order_by('-search_rank', '-id')
+
+
+def search_fallback(queryset, search):
+    condition = Q()
+    for column in NAME_COLUMNS + DESCRIPTION_COLUMNS:
+        condition |= Q(**{f'{column}__icontains': search})
+    return queryset.filter(condition).order_by('-id')
+
+
+def search_competitions(queryset, search):
+    search = (search or '').strip()
+    if not search:
+        return queryset.order_by('-id')
+    if connection.vendor == 'postgresql':
+        return search_postgres(queryset, search)
+    if connection.vendor == 'sqlite':
+        return search_sqlite(queryset, search)
+    return search_fallback(queryset, search)
+
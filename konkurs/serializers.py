@@ -5,6 +5,7 @@ from child.models import Child
 from jury.models import Assessment
 from konkurs_admin.models import (
     Notification,
+    BroadcastNotification,
     Winner,
     ResultImage,
     WebCertificate, SubscriptionModel
@@ -15,27 +16,22 @@ from .models import (
     APPROVEMENT,
     MARKED_STATUS,
     Participant,
-    ChildWork
+    ChildWork,
+    PublishedWork,
 )
-from django.conf import settings
 from konkurs.models import ContactUs
+from konkurs_admin.images import SrcsetField, ThumbnailField
+from base.serializers import TranslatedModelSerializer
 from django.utils.translation import gettext_lazy as _
 
 
-class BannerSerializer(serializers.ModelSerializer):
+class BannerSerializer(TranslatedModelSerializer):
+    translated_fields = ('name', 'description')
+    image_srcset = SrcsetField(source='image')
+
     class Meta:
         model = Competition
-        fields = ['id', 'image', 'name', 'description']
-
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['name'] = getattr(instance, f'name_{lang}')
-            data['description'] = getattr(instance, f'description_{lang}')
-        return data
+        fields = ['id', 'image', 'image_srcset', 'name', 'description']
 
 
 class CompetitionSerializer(serializers.ModelSerializer):
@@ -51,8 +47,9 @@ class CompetitionSerializer(serializers.ModelSerializer):
         return data
 
 
-class GetCompSerializer(serializers.ModelSerializer):
-    participants = serializers.SerializerMethodField(source='get_participants')
+class GetCompSerializer(TranslatedModelSerializer):
+    translated_fields = ('name', 'description')
+    participants = serializers.IntegerField(source='participants_count', read_only=True)
 
     class Meta:
         model = Competition
@@ -61,19 +58,6 @@ class GetCompSerializer(serializers.ModelSerializer):
                   'application_end_date', 'application_end_time', 'participation_fee', 'rules', 'physical_certificate',
                   'image', 'status', 'participants']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['name'] = getattr(instance, f'name_{lang}')
-            data['description'] = getattr(instance, f'description_{lang}')
-        return data
-
-    def get_participants(self, obj):
-        return Participant.objects.filter(competition=obj).count()
-
 
 class CompAssessmentSerializer(serializers.ModelSerializer):
     class Meta:
@@ -81,37 +65,22 @@ class CompAssessmentSerializer(serializers.ModelSerializer):
         fields = ['id', 'grade', 'comment']
 
 
-class HomeCompetitionSerializer(serializers.ModelSerializer):
+class HomeCompetitionSerializer(TranslatedModelSerializer):
+    translated_fields = ('name', 'description')
+    image_srcset = SrcsetField(source='image')
+
     class Meta:
         model = Competition
-        fields = ['id', 'image', 'name', 'description', 'rules', 'application_end_date', ]
+        fields = ['id', 'image', 'image_srcset', 'name', 'description', 'rules', 'application_end_date', ]
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['name'] = getattr(instance, f'name_{lang}')
-            data['description'] = getattr(instance, f'description_{lang}')
-        return data
 
+class CompetitionForCompetitionPageSerializer(TranslatedModelSerializer):
+    translated_fields = ('name', 'description')
 
-class CompetitionForCompetitionPageSerializer(serializers.ModelSerializer):
     class Meta:
         model = Competition
         fields = ['id', 'name', 'description', 'image']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['name'] = getattr(instance, f'name_{lang}')
-            data['description'] = getattr(instance, f'description_{lang}')
-        return data
-
 
 class PersonalInfoSerializer(serializers.ModelSerializer):
     class Meta:
@@ -179,19 +148,31 @@ class ParticipantSerializer(serializers.ModelSerializer):
         return data
 
 
-class CompSerializer(serializers.ModelSerializer):
+class CompSerializer(TranslatedModelSerializer):
+    translated_fields = ('name',)
+
     class Meta:
         model = Competition
         fields = ['id', 'name']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['name'] = getattr(instance, f'name_{lang}')
-        return data
+
+class GradeHistoryItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Assessment
+        fields = ['id', 'grade', 'comment', 'created_at']
+
+
+class GradeHistorySerializer(serializers.ModelSerializer):
+    child = serializers.SerializerMethodField()
+    competition = CompSerializer()
+    grades = GradeHistoryItemSerializer(source='assessment_set', many=True)
+
+    class Meta:
+        model = Participant
+        fields = ['id', 'child', 'competition', 'grades']
+
+    def get_child(self, obj):
+        return {'id': obj.child_id, 'name': f'{obj.child.first_name} {obj.child.last_name}'}
 
 
 class CompParticipantSerializer(serializers.ModelSerializer):
@@ -207,27 +188,14 @@ class CompParticipantSerializer(serializers.ModelSerializer):
         return data
 
 
-class ActiveCompSerializer(serializers.ModelSerializer):
-    participants = serializers.SerializerMethodField()
+class ActiveCompSerializer(TranslatedModelSerializer):
+    translated_fields = ('name', 'description')
+    participants = serializers.IntegerField(source='participants_count', read_only=True)
 
     class Meta:
         model = Competition
         fields = ['id', 'name', 'participants', 'comp_end_date', 'description']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['name'] = getattr(instance, f'name_{lang}')
-            data['description'] = getattr(instance, f'description_{lang}')
-        return data
-
-    def get_participants(self, obj):
-        participants = Participant.objects.filter(competition__id=obj.id).count()
-        return participants
-
 
 class ActiveParticipantSerializer(serializers.ModelSerializer):
     competition = ActiveCompSerializer()
@@ -242,21 +210,13 @@ class ActiveParticipantSerializer(serializers.ModelSerializer):
         return data
 
 
-class FinishedCompSerializer(serializers.ModelSerializer):
+class FinishedCompSerializer(TranslatedModelSerializer):
+    translated_fields = ('name', 'description')
+
     class Meta:
         model = Competition
         fields = ['id', 'name', 'description']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['name'] = getattr(instance, f'name_{lang}')
-            data['description'] = getattr(instance, f'description_{lang}')
-        return data
-
 
 class GradeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -299,21 +259,17 @@ class WorksSerializer(serializers.ModelSerializer):
         fields = ['id', 'competition', 'files']
 
 
-class GallerySerializer(serializers.ModelSerializer):
+class GallerySerializer(TranslatedModelSerializer):
+    files_srcset = SrcsetField(source='files')
+
     class Meta:
-        model = ChildWork
-        fields = ['competition', 'files']
+        model = PublishedWork
+        fields = ['id', 'participant', 'competition', 'files', 'files_srcset']
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
         if instance.competition is not None:
-            if lang in lang_options:
-                data['competition'] = getattr(instance.competition, f'name_{lang}')
-            else:
-                data['competition'] = instance.competition.name
+            data['competition'] = getattr(instance.competition, f'name_{self.get_language()}')
         else:
             data['competition'] = None
         return data
@@ -325,7 +281,7 @@ class CompGallerySerializer(serializers.ModelSerializer):
         fields = ['name', 'category']
 
 
-class GalleryDetailsSerializer(serializers.ModelSerializer):
+class GalleryDetailsSerializer(TranslatedModelSerializer):
     competition = CompGallerySerializer()
     files = serializers.SerializerMethodField(source='get_files')
 
@@ -335,11 +291,7 @@ class GalleryDetailsSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['competition'] = getattr(instance.competition, f'name_{lang}')
+        data['competition'] = getattr(instance.competition, f'name_{self.get_language()}')
         return data
 
     def get_files(self, obj):
@@ -349,34 +301,81 @@ class GalleryDetailsSerializer(serializers.ModelSerializer):
         return None
 
 
-class ExpertSerializer(serializers.ModelSerializer):
+class LeaderboardSerializer(serializers.ModelSerializer):
+    rank = serializers.SerializerMethodField(source='get_rank')
+    full_name = serializers.SerializerMethodField(source='get_full_name')
+    grade = serializers.SerializerMethodField(source='get_grade')
+
     class Meta:
-        model = User
-        fields = ['id', 'first_name', 'last_name', 'speciality', 'place_of_work', 'image']
+        model = Participant
+        fields = ['rank', 'id', 'full_name', 'grade']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['speciality'] = getattr(instance, f'speciality_{lang}')
-            data['place_of_work'] = getattr(instance, f'place_of_work_{lang}')
-        data['speciality'] = instance.speciality
-        data['place_of_work'] = instance.place_of_work
-        return data
+    def get_rank(self, obj):
+        return self.context['ranks'][obj.id][0] + 1
+
+    def get_full_name(self, obj):
+        if obj.child is None:
+            return None
+        return f'{obj.child.first_name} {obj.child.last_name}'
+
+    def get_grade(self, obj):
+        return round(self.context['ranks'][obj.id][1], 2)
+
+
+class ExpertSerializer(TranslatedModelSerializer):
+    translated_fields = ('speciality', 'place_of_work')
+    image_srcset = SrcsetField(source='image')
+    thumbnail = ThumbnailField(source='image')
+
+    class Meta:
+        model = User
+        fields = ['id', 'first_name', 'last_name', 'speciality', 'place_of_work', 'category', 'image', 'image_srcset',
+                  'thumbnail']
 
 
 class NotificationSerializer(serializers.ModelSerializer):
+    kind = serializers.SerializerMethodField()
+
     class Meta:
         model = Notification
-        fields = ['id', 'child', 'competition', 'grade', 'comment', 'message', 'is_read']
+        fields = ['id', 'kind', 'child', 'competition', 'grade', 'comment', 'message', 'is_read', 'created_at']
+
+    def get_kind(self, obj):
+        return 'personal'
+
+
+class BroadcastNotificationSerializer(serializers.ModelSerializer):
+    kind = serializers.SerializerMethodField()
+    is_read = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BroadcastNotification
+        fields = ['id', 'kind', 'competition', 'message', 'is_read', 'created_at']
+
+    def get_kind(self, obj):
+        return 'broadcast'
+
+    def get_is_read(self, obj):
+        return obj.id <= self.context.get('last_read_id', 0)
+
+
+class MarkNotificationsReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=1000,
+                                help_text='Ids of personal notifications; broadcasts are only marked read by before')
+    before = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        if 'ids' not in data and 'before' not in data:
+            raise serializers.ValidationError(_('ids or before is required'))
+        return data
 
 
 class ResultImageSerializer(serializers.ModelSerializer):
+    image_srcset = SrcsetField(source='image')
+
     class Meta:
         model = ResultImage
-        fields = ['id', 'name', 'image']
+        fields = ['id', 'name', 'image', 'image_srcset']
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -1,39 +1,159 @@
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.db import transaction
-from konkurs_admin.models import Notification
+from django.dispatch import Signal, receiver
+from konkurs_admin.models import (
+    ImageDerivative,
+    Policy,
+    AboutUs,
+    AboutResult,
+    ContactInformation,
+    SocialMedia,
+    ResultImage,
+    WebCertificate,
+)
 from authentication.models import User
 from konkurs.models import (
     Competition,
+    CompetitionTransition,
     Participant
 )
+from konkurs_admin.notifications import ALL_CANDIDATES, broadcast
+from konkurs_admin.tasks import notify_competition_participants
+from .cache import bump_section_version
+from .utils import ACCEPTED, schedule_competition_events, update_participant_counts
 from django.utils.translation import gettext_lazy  as _
 
+CONTENT_SECTIONS = {
+    Policy: 'policy',
+    AboutUs: 'about_us',
+    AboutResult: 'about_result',
+    ContactInformation: 'contact_info',
+    SocialMedia: 'social_media',
+    ResultImage: 'result_images',
+    WebCertificate: 'web_certificate',
+}
+
+COMPETITION_SECTIONS = ('banner', 'home_competitions')
+
+# Cached sections that show images of each model; child works are not cached, so they bump nothing.
+IMAGE_OWNER_SECTIONS = {
+    **{model._meta.label: (section,) for model, section in CONTENT_SECTIONS.items()},
+    Competition._meta.label: COMPETITION_SECTIONS,
+    User._meta.label: ('experts',),
+}
+
+
+# Sent once per competition when it becomes active or finished, never on ordinary edits.
+competition_started = Signal()
+competition_finished = Signal()
+
+STATUS_TRANSITIONS = {
+    1: competition_started,
+    2: competition_finished,
+}
+
+
+@receiver(post_save, sender=Competition)
+def post_save_for_status_transition(sender, instance, created, **kwargs):
+    previous_status = getattr(instance, 'previous_status', None)
+    transition = STATUS_TRANSITIONS.get(instance.status)
+    if transition is None or instance.status == previous_status:
+        return
+    with transaction.atomic():
+        claimed = CompetitionTransition.objects.get_or_create(competition=instance, status=instance.status)[1]
+        if claimed:
+            transition.send(sender=Competition, instance=instance, previous_status=previous_status)
+
 
 @receiver(post_save, sender=Competition)
-def post_save_for_winner(sender, instance, created, **kwargs):
-    if instance.status == 2:
-        message = (
-                _("%(name)s competition is finished. You can see your result") % {"name": instance.name}
-        )
-        participants = Participant.objects.filter(competition=instance)
-        notifications = [
-            Notification(user=participant.child.user, child=participant.child,
-                         message=message, competition=participant.competition)
-            for participant in participants if participant.child and participant.child.user
-        ]
-        with transaction.atomic():
-            Notification.objects.bulk_create(notifications)
-
-    if instance.status == 1:
-        message = (
-                _('%(name)s competition is started.') % {'name': instance.name}
-        )
-        participants = User.objects.filter(role=1)
-        notifications = [
-            Notification(user=participant,
-                         message=message, competition=instance)
-            for participant in participants
-        ]
-        with transaction.atomic():
-            Notification.objects.bulk_create(notifications)
+def post_save_for_event_schedule(sender, instance, **kwargs):
+    schedule_competition_events(instance)
+
+
+@receiver(competition_finished)
+def notify_participants_on_finish(sender, instance, **kwargs):
+    message = (
+            _("%(name)s competition is finished. You can see your result") % {"name": instance.name}
+    )
+    # The fan-out runs in a worker so saving the competition does not wait for it.
+    transaction.on_commit(lambda: notify_competition_participants.delay(instance.id, str(message)))
+
+
+@receiver(competition_started)
+def notify_candidates_on_start(sender, instance, **kwargs):
+    message = (
+            _('%(name)s competition is started.') % {'name': instance.name}
+    )
+    broadcast(ALL_CANDIDATES, message, competition_id=instance.id, key=f'competition-started:{instance.id}')
+
+
+@receiver(post_save, sender=Competition)
+@receiver(post_delete, sender=Competition)
+def post_change_for_competition_sections(sender, **kwargs):
+    for section in COMPETITION_SECTIONS:
+        bump_section_version(section)
+
+
+def post_change_for_content(sender, **kwargs):
+    bump_section_version(CONTENT_SECTIONS[sender])
+
+
+for model in CONTENT_SECTIONS:
+    post_save.connect(post_change_for_content, sender=model, dispatch_uid=f'content_save_{model._meta.label}')
+    post_delete.connect(post_change_for_content, sender=model, dispatch_uid=f'content_delete_{model._meta.label}')
+
+
+@receiver(post_save, sender=ImageDerivative)
+def post_save_for_image_derivative(sender, instance, **kwargs):
+    # Cached sections embed srcset maps, so new derivatives have to show up in the sections using the image.
+    for section in IMAGE_OWNER_SECTIONS.get(instance.owner, ()):
+        bump_section_version(section)
+
+
+@receiver(pre_save, sender=User)
+def pre_save_user_for_experts(sender, instance, update_fields=None, **kwargs):
+    instance.was_expert = False
+    if instance.pk and instance.role != 2 and (update_fields is None or 'role' in update_fields):
+        instance.was_expert = User.objects.filter(pk=instance.pk, role=2).exists()
+
+
+@receiver(post_save, sender=User)
+def post_save_user_for_experts(sender, instance, **kwargs):
+    if instance.role == 2 or getattr(instance, 'was_expert', False):
+        bump_section_version('experts')
+
+
+@receiver(post_delete, sender=User)
+def post_delete_user_for_experts(sender, instance, **kwargs):
+    if instance.role == 2:
+        bump_section_version('experts')
+
+
+@receiver(pre_save, sender=Participant)
+def pre_save_participant_counts(sender, instance, **kwargs):
+    instance.previous_state = None
+    if instance.pk:
+        instance.previous_state = Participant.objects.filter(pk=instance.pk).values_list(
+            'competition_id', 'action').first()
+
+
+@receiver(post_save, sender=Participant)
+def post_save_participant_counts(sender, instance, created, **kwargs):
+    previous = getattr(instance, 'previous_state', None)
+    if created or previous is None:
+        update_participant_counts(instance.competition_id, participants=1,
+                                  accepted=int(instance.action == ACCEPTED))
+        return
+    competition_id, action = previous
+    was_accepted, is_accepted = action == ACCEPTED, instance.action == ACCEPTED
+    if competition_id != instance.competition_id:
+        update_participant_counts(competition_id, participants=-1, accepted=-int(was_accepted))
+        update_participant_counts(instance.competition_id, participants=1, accepted=int(is_accepted))
+    elif was_accepted != is_accepted:
+        update_participant_counts(instance.competition_id, accepted=1 if is_accepted else -1)
+
+
+@receiver(post_delete, sender=Participant)
+def post_delete_participant_counts(sender, instance, **kwargs):
+    update_participant_counts(instance.competition_id, participants=-1,
+                              accepted=-int(instance.action == ACCEPTED))
@@ -5,6 +5,7 @@ from .views import (
     ContactUsViewSet,
     DynamicInfoViewSet,
     SubscriptionViewSet, ForTestViewSet,
+    notification_stream,
 )
 
 urlpatterns = [
@@ -14,11 +15,15 @@ urlpatterns = [
          name='get_home_page_competitions'),
     # competitions for competitions page
     path('get_competitions/', CompetitionViewSet.as_view({'get': 'get_comp'}), name='get_competitions'),
+    path('search_competitions/', CompetitionViewSet.as_view({'get': 'search_comp'}), name='search_competitions'),
     path('get_gallery/', CompetitionViewSet.as_view({'get': 'get_gallery'}), name='get_gallery'),
     path('get_experts/', CompetitionViewSet.as_view({'get': 'get_experts'}), name='get_experts'),
+    path('home/', CompetitionViewSet.as_view({'get': 'get_home'}), name='home'),
     path('get_results/', CompetitionViewSet.as_view({'get': 'get_results'}), name='get_results'),
     path('get_comp_by_id/<int:pk>/', CompetitionViewSet.as_view({'get': 'get_by_id'}),
          name='get_comp_details'),
+    path('get_leaderboard/<int:pk>/', CompetitionViewSet.as_view({'get': 'get_leaderboard'}),
+         name='get_leaderboard'),
     path('get_gallery_details/<int:pk>/', CompetitionViewSet.as_view({'get': 'get_gallery_details'}),
          name='get_gallery_details'),
     # my competition
@@ -31,6 +36,11 @@ urlpatterns = [
     path('get_grade_by_id/<int:pk>/', MyCompetitionViewSet.as_view({'get': 'get_grade_history_by_id'}),
          name='get_grade_history_by_id'),
     path('get_notifications/', MyCompetitionViewSet.as_view({'get': 'get_notifications'}), name='get_notifications'),
+    path('mark_notifications_read/', MyCompetitionViewSet.as_view({'post': 'mark_read'}),
+         name='mark_notifications_read'),
+    path('notifications/stream_ticket/', MyCompetitionViewSet.as_view({'post': 'stream_ticket'}),
+         name='notification_stream_ticket'),
+    path('notifications/stream/', notification_stream, name='notification_stream'),
     path('get_notification_by_id/<int:pk>/', MyCompetitionViewSet.as_view({'get': 'get_notification_by_id'}),
          name='get_notification_by_id'),
     # path('', MyCompetitionViewSet.as_view({'get': 'subscriptions'})),
@@ -46,6 +56,8 @@ urlpatterns = [
     path('get_all_policy/', DynamicInfoViewSet.as_view({'get': 'get_all_policy'}), name='get_all_policy'),
     path('get_all_result_img/', DynamicInfoViewSet.as_view({'get': 'get_web_result_image'}),
          name='get_all_result_img'),
+    path('get_site_content/', DynamicInfoViewSet.as_view({'get': 'get_site_content'}),
+         name='get_site_content'),
 
     # subscription
     path('get_all_subscription/', SubscriptionViewSet.as_view({'get': 'get_all'}),
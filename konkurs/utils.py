@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import (
+    COMPETITION_ENDS_SOON,
+    COMPETITION_STARTS_SOON,
+    REGISTRATION_ENDED,
+    REGISTRATION_ENDS_SOON,
+    REGISTRATION_STARTED,
+    REGISTRATION_STARTS_SOON,
+    Competition,
+    CompetitionEvent,
+    ChildWork,
+    PublishedWork,
+)
+
+ACCEPTED = 2
+
+# event_type: (date field, time field, days before)
+EVENT_SCHEDULE = {
+    REGISTRATION_STARTS_SOON: ('application_start_date', 'application_start_time', 3),
+    REGISTRATION_STARTED: ('application_start_date', 'application_start_time', 0),
+    REGISTRATION_ENDS_SOON: ('application_end_date', 'application_end_time', 3),
+    REGISTRATION_ENDED: ('application_end_date', 'application_end_time', 0),
+    COMPETITION_STARTS_SOON: ('comp_start_date', 'comp_start_time', 3),
+    COMPETITION_ENDS_SOON: ('comp_end_date', 'comp_end_time', 3),
+}
+
+
+def publish_works(works):
+    published = [
+        PublishedWork(
+            child_work_id=work.id,
+            participant_id=work.participant_id,
+            competition_id=work.competition_id,
+            category_id=work.competition.category_id,
+            files=work.files.name,
+        )
+        for work in works if work.competition_id is not None
+    ]
+    PublishedWork.objects.bulk_create(published, ignore_conflicts=True)
+
+
+def publish_participant_works(participant):
+    works = ChildWork.objects.filter(participant=participant).select_related('competition')
+    publish_works(works)
+
+
+def unpublish_participant_works(participant):
+    PublishedWork.objects.filter(participant=participant).delete()
+
+
+def update_participant_counts(competition_id, participants=0, accepted=0):
+    changes = {}
+    if participants:
+        changes['participants_count'] = Greatest(F('participants_count') + participants, 0)
+    if accepted:
+        changes['accepted_count'] = Greatest(F('accepted_count') + accepted, 0)
+    if competition_id is None or not changes:
+        return
+    # updated_at moves with the counts so conditional GETs on the competition revalidate.
+    Competition.objects.filter(id=competition_id).update(updated_at=timezone.now(), **changes)
+
+
+def recount_participants(queryset=None, batch_size=500):
+    queryset = Competition.objects.all() if queryset is None else queryset
+    competitions = queryset.order_by().annotate(
+        actual_participants=Count('participant'),
+        actual_accepted=Count('participant', filter=Q(participant__action=ACCEPTED)),
+    ).only('id', 'participants_count', 'accepted_count')
+    now = timezone.now()
+    changed = []
+    for competition in competitions.iterator(chunk_size=batch_size):
+        if (competition.participants_count, competition.accepted_count) == (
+                competition.actual_participants, competition.actual_accepted):
+            continue
+        competition.participants_count = competition.actual_participants
+        competition.accepted_count = competition.actual_accepted
+        competition.updated_at = now
+        changed.append(competition)
+    Competition.objects.bulk_update(changed, ['participants_count', 'accepted_count', 'updated_at'],
+                                    batch_size=batch_size)
+    return len(changed)
+
+
+def get_event_times(competition):
+    times = {}
+    for event_type, (date_field, time_field, days_before) in EVENT_SCHEDULE.items():
+        date, time = getattr(competition, date_field), getattr(competition, time_field)
+        if date is not None and time is not None:
+            times[event_type] = datetime.combine(date, time) - timedelta(days=days_before)
+    return times
+
+
+def schedule_competition_events(competition):
+    now = timezone.now()
+    existing = {event.event_type: event for event in CompetitionEvent.objects.filter(competition=competition)}
+    created, changed = [], []
+    for event_type, fire_at in get_event_times(competition).items():
+        event = existing.get(event_type)
+        if event is None:
+            # Reminders whose time has already passed when they are scheduled are not sent late.
+            created.append(CompetitionEvent(competition=competition, event_type=event_type,
+                                            fire_at=fire_at, fired=fire_at <= now))
+        elif event.fire_at != fire_at:
+            event.fire_at = fire_at
+            event.fired = fire_at <= now
+            event.updated_at = now
+            changed.append(event)
+    CompetitionEvent.objects.bulk_create(created, ignore_conflicts=True)
+    CompetitionEvent.objects.bulk_update(changed, ['fire_at', 'fired', 'updated_at'])
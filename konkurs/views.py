@@ -1,14 +1,21 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework import status
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
+from jury.leaderboard import get_rank, get_top
 from jury.models import Assessment
 from jury.serializers import AssessmentHistorySerializer
-from authentication.models import User
+from authentication.models import User, BlacklistedAccessToken
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
 from konkurs_admin.models import (
     Notification,
-    Winner,
+    ArchivedNotification,
     WebCertificate,
     ResultImage,
     Policy,
@@ -32,9 +39,13 @@ from .serializers import (
     CompetitionForCompetitionPageSerializer,
     GallerySerializer,
     GalleryDetailsSerializer,
+    LeaderboardSerializer,
     ExpertSerializer,
     BannerSerializer,
     NotificationSerializer,
+    BroadcastNotificationSerializer,
+    GradeHistorySerializer,
+    MarkNotificationsReadSerializer,
     ResultsSerializer,
     GetCompSerializer,
     ContactUsSerializer,
@@ -43,13 +54,97 @@ from .serializers import (
     GetSubscriptionsSerializer,
     SubscribeCompetitionSerializer,
 )
+from base.conditional import conditional_response
+from base.pubsub import subscribe
+from base.translation import get_request_language, only_language
+from konkurs_admin.notifications import (
+    BROADCAST,
+    BROADCAST_CHANNEL,
+    PERSONAL,
+    buffer_read_receipt,
+    count_unread,
+    get_history,
+    get_inbox,
+    is_broadcast_visible,
+    issue_stream_ticket,
+    mark_notifications_read,
+    redeem_stream_ticket,
+    STREAM_TICKET_TTL,
+    user_channel,
+)
+from konkurs_admin.pagination import CustomCursorPagination, CustomPagination, InboxCursorPagination
+from konkurs_admin.statistics import get_statistics
+from .search import search_competitions
+from .cache import (
+    get_cached_section,
+    combine_versions,
+    versioned_response,
+)
 from .models import (
     Competition,
     Participant,
-    ChildWork,
+    PublishedWork,
 )
+from django.db.models import Exists, OuterRef, Prefetch
 from django.utils.translation import gettext_lazy  as _
 
+CONTENT_SERIALIZERS = {
+    'policy': (PolicySerializer, Policy),
+    'about_us': (AboutUsSerializer, AboutUs),
+    'about_result': (AboutResultSerializer, AboutResult),
+    'contact_info': (ContactInformationSerializer, ContactInformation),
+    'social_media': (WebSocialMediaSerializer, SocialMedia),
+    'result_images': (ResultImageSerializer, ResultImage),
+}
+
+
+def get_content_section(section, request):
+    serializer_class, model = CONTENT_SERIALIZERS[section]
+    return get_cached_section(section, request, lambda: serializer_class(
+        model.objects.all(), many=True, context={'request': request}).data)
+
+
+def get_banner_section(request):
+    return get_cached_section('banner', request, lambda: BannerSerializer(
+        only_language(Competition.objects.order_by('-created_at'), get_request_language(request)).first(),
+        context={'request': request}).data)
+
+
+def get_home_competitions_section(request):
+    return get_cached_section('home_competitions', request, lambda: HomeCompetitionSerializer(
+        only_language(Competition.objects.filter(status=1), get_request_language(request)),
+        many=True, context={'request': request}).data)
+
+
+def build_web_certificate(request):
+    certificate = WebCertificate.objects.first()
+    if certificate is None:
+        return {'year': 0, 'image': None}
+    return {
+        'year': certificate.data.year if certificate.data else 0,
+        'image': WebCerSerializer(certificate, context={'request': request}).data,
+    }
+
+
+def get_results_data(request):
+    certificate, certificate_version = get_cached_section('web_certificate', request,
+                                                          lambda: build_web_certificate(request))
+    images, images_version = get_content_section('result_images', request)
+    # Counters change on every registration, so they are read live from their single row.
+    statistics = get_statistics()
+    data = {
+        "participants": statistics.participants,
+        "winners": statistics.winners,
+        "awards": statistics.awards,
+        "certificate": certificate['year'],
+        "certificate_image": certificate['image'],
+        "creative_works": statistics.creative_works,
+        "images": images
+    }
+    versions = [certificate_version, images_version, statistics.participants, statistics.winners,
+                statistics.awards, statistics.creative_works]
+    return data, versions
+
 
 class CompetitionViewSet(ViewSet):
     @swagger_auto_schema(
@@ -61,9 +156,12 @@ class CompetitionViewSet(ViewSet):
         tags=['competition']
     )
     def get_main_banner(self, request, *args, **kwargs):
-        banner = Competition.objects.filter().order_by('-created_at').first()
-        serializer = BannerSerializer(banner, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        def build():
+            banner = only_language(Competition.objects.order_by('-created_at'), get_request_language(request)).first()
+            serializer = BannerSerializer(banner, context={'request': request})
+            return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        return conditional_response(request, build, Competition.objects.all())
 
     @swagger_auto_schema(
         operation_description="Get All Competition For Home Page",
@@ -75,8 +173,13 @@ class CompetitionViewSet(ViewSet):
     )
     def get_comp_for_home(self, request, *args, **kwargs):
         home_comps = Competition.objects.filter(status=1)
-        serializer = HomeCompetitionSerializer(home_comps, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        def build():
+            serializer = HomeCompetitionSerializer(only_language(home_comps, get_request_language(request)),
+                                                   many=True, context={'request': request})
+            return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        return conditional_response(request, build, home_comps)
 
     @swagger_auto_schema(
         operation_description="Get All Competition For Competition Page",
@@ -88,34 +191,154 @@ class CompetitionViewSet(ViewSet):
     )
     def get_comp(self, request, *args, **kwargs):
         comp = Competition.objects.all()
-        serializer = CompetitionForCompetitionPageSerializer(comp, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        def build():
+            serializer = CompetitionForCompetitionPageSerializer(only_language(comp, get_request_language(request)),
+                                                                 many=True, context={'request': request})
+            return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        return conditional_response(request, build, comp)
+
+    @swagger_auto_schema(
+        operation_description="Search competitions by name and description in every language",
+        operation_summary="Search Competitions",
+        manual_parameters=[
+            openapi.Parameter(
+                'search', openapi.IN_QUERY,
+                description="Search text",
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'page', openapi.IN_QUERY,
+                description="Page number (e.g., ?page=1)",
+                type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY,
+                description="Number of items per page (e.g., ?page_size=10)",
+                type=openapi.TYPE_INTEGER
+            ),
+        ],
+        responses={
+            200: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'count': openapi.Schema(type=openapi.TYPE_INTEGER, description='Total competitions'),
+                    'total_pages': openapi.Schema(type=openapi.TYPE_INTEGER, description='Total pages available'),
+                    'current_page': openapi.Schema(type=openapi.TYPE_INTEGER, description='Current page number'),
+                    'next': openapi.Schema(type=openapi.TYPE_STRING, nullable=True, description='Next page URL'),
+                    'previous': openapi.Schema(type=openapi.TYPE_STRING, nullable=True,
+                                               description='Previous page URL'),
+                    'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_OBJECT))
+                }
+            ),
+        },
+        tags=['competition']
+    )
+    def search_comp(self, request, *args, **kwargs):
+        search = request.GET.get('search', '')
+        comps = search_competitions(only_language(Competition.objects.all(), get_request_language(request)), search)
+        paginator = CustomPagination()
+        paginated_comps = paginator.paginate_queryset(comps, request, view=self)
+        serializer = CompetitionForCompetitionPageSerializer(paginated_comps, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
     @swagger_auto_schema(
         operation_description="Get Gallery",
         operation_summary="Get Gallery",
+        manual_parameters=[
+            openapi.Parameter(
+                'cursor', openapi.IN_QUERY,
+                description="Cursor from the next/previous link",
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY,
+                description="Number of items per page (e.g., ?page_size=20)",
+                type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'competition', openapi.IN_QUERY,
+                description="Filter by competition id",
+                type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'category', openapi.IN_QUERY,
+                description="Filter by category id",
+                type=openapi.TYPE_INTEGER
+            ),
+        ],
         responses={
-            200: GallerySerializer(),
+            200: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'next': openapi.Schema(type=openapi.TYPE_STRING, nullable=True, description='Next page URL'),
+                    'previous': openapi.Schema(type=openapi.TYPE_STRING, nullable=True,
+                                               description='Previous page URL'),
+                    'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_OBJECT))
+                }
+            ),
         },
         tags=['competition']
     )
     def get_gallery(self, request, *args, **kwargs):
-        works = ChildWork.objects.filter(participant__action=2)
-        serializer = GallerySerializer(works, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        competition = request.GET.get('competition')
+        category = request.GET.get('category')
+        works = only_language(PublishedWork.objects.select_related('competition'), get_request_language(request),
+                              model=Competition, prefix='competition__')
+        if competition:
+            if not competition.isdigit():
+                return Response(data={'error': _('competition must be integer')}, status=status.HTTP_400_BAD_REQUEST)
+            works = works.filter(competition_id=competition)
+        if category:
+            if not category.isdigit():
+                return Response(data={'error': _('category must be integer')}, status=status.HTTP_400_BAD_REQUEST)
+            works = works.filter(category_id=category)
+        paginator = CustomCursorPagination()
+        paginated_works = paginator.paginate_queryset(works, request, view=self)
+        serializer = GallerySerializer(paginated_works, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
     @swagger_auto_schema(
         operation_description="Get All Experts",
         operation_summary="Get All Experts",
+        manual_parameters=[
+            openapi.Parameter(
+                'category', openapi.IN_QUERY,
+                description="Filter by category id",
+                type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'page', openapi.IN_QUERY,
+                description="Page number (e.g., ?page=1)",
+                type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY,
+                description="Number of items per page (e.g., ?page_size=10)",
+                type=openapi.TYPE_INTEGER
+            ),
+        ],
         responses={
             200: ExpertSerializer(),
         },
         tags=['competition']
     )
     def get_experts(self, request, *args, **kwargs):
-        experts = User.objects.filter(role=2)
-        serializer = ExpertSerializer(experts, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        category = request.GET.get('category')
+        if category and not category.isdigit():
+            return Response(data={'error': _('category must be integer')}, status=status.HTTP_400_BAD_REQUEST)
+        # Cards are built once per language and version; views only filter and slice the cached list.
+        cards, version = get_cached_section('experts', request, lambda: ExpertSerializer(
+            only_language(User.objects.filter(role=2).order_by('id'), get_request_language(request)),
+            many=True, context={'request': request}).data)
+        if category:
+            cards = [card for card in cards if card['category'] == int(category)]
+        paginator = CustomPagination()
+        paginated_cards = paginator.paginate_queryset(cards, request, view=self)
+        response = paginator.get_paginated_response(paginated_cards)
+        response['X-Content-Version'] = str(version)
+        return response
 
     @swagger_auto_schema(
         operation_description="Get Results",
@@ -126,31 +349,47 @@ class CompetitionViewSet(ViewSet):
         tags=['competition']
     )
     def get_results(self, request, *args, **kwargs):
-        participants = Participant.objects.all().count()
-        winners = Winner.objects.filter(place=1).count()
-        awards = 0
-        certificate_obj = WebCertificate.objects.all().first()
-        if certificate_obj:
-            certificate = certificate_obj.data.year if certificate_obj.data else 0
-            cer_serializer = WebCerSerializer(certificate_obj, context={'request': request})
-        else:
-            certificate = 0
-            cer_serializer = ''
-        creative_works = 0
-        images = ResultImage.objects.all()
-
-        serialized_images = ResultImageSerializer(images, many=True, context={'request': request})
-
-        result_data = {
-            "participants": participants,
-            "winners": winners,
-            "awards": awards,
-            "certificate": certificate,
-            "certificate_image": cer_serializer.data,
-            "creative_works": creative_works,
-            "images": serialized_images.data
+        result_data, versions = get_results_data(request)
+        return versioned_response(request, result_data, combine_versions(versions))
+
+    @swagger_auto_schema(
+        operation_description="Get every home page section in one response",
+        operation_summary="Get Home Page",
+        responses={
+            200: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'version': openapi.Schema(type=openapi.TYPE_STRING, description='Content version'),
+                    'banner': openapi.Schema(type=openapi.TYPE_OBJECT),
+                    'competitions': openapi.Schema(type=openapi.TYPE_ARRAY,
+                                                   items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                    'results': openapi.Schema(type=openapi.TYPE_OBJECT),
+                    'social_media': openapi.Schema(type=openapi.TYPE_ARRAY,
+                                                   items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                    'contact_info': openapi.Schema(type=openapi.TYPE_ARRAY,
+                                                   items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                }
+            ),
+            304: 'Not Modified',
+        },
+        tags=['competition']
+    )
+    def get_home(self, request, *args, **kwargs):
+        banner, banner_version = get_banner_section(request)
+        competitions, competitions_version = get_home_competitions_section(request)
+        results, results_versions = get_results_data(request)
+        social_media, social_media_version = get_content_section('social_media', request)
+        contact_info, contact_info_version = get_content_section('contact_info', request)
+        data = {
+            'banner': banner,
+            'competitions': competitions,
+            'results': results,
+            'social_media': social_media,
+            'contact_info': contact_info,
         }
-        return Response(data=result_data, status=status.HTTP_200_OK)
+        data['version'] = combine_versions(
+            [banner_version, competitions_version, social_media_version, contact_info_version] + results_versions)
+        return versioned_response(request, data, data['version'])
 
     @swagger_auto_schema(
         operation_description="Get competition by id",
@@ -161,11 +400,70 @@ class CompetitionViewSet(ViewSet):
         tags=['competition']
     )
     def get_by_id(self, request, *args, **kwargs):
-        comp = Competition.objects.filter(id=kwargs['pk']).first()
+        comps = Competition.objects.filter(id=kwargs['pk'])
+
+        def build():
+            comp = only_language(comps, get_request_language(request)).first()
+            if comp is None:
+                return Response(data={'error': _('Comp not found')}, status=status.HTTP_404_NOT_FOUND)
+            serializer = GetCompSerializer(comp, context={'request': request})
+            return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        return conditional_response(request, build, comps)
+
+    @swagger_auto_schema(
+        operation_description="Ranking of a finished competition, best grade first. "
+                              "Pass participant to get that participant's place as well.",
+        operation_summary="Get Leaderboard",
+        manual_parameters=[
+            openapi.Parameter('size', type=openapi.TYPE_INTEGER, description='Number of top places, up to 100',
+                              in_=openapi.IN_QUERY),
+            openapi.Parameter('participant', type=openapi.TYPE_INTEGER, description='participant id',
+                              in_=openapi.IN_QUERY),
+        ],
+        responses={
+            200: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'count': openapi.Schema(type=openapi.TYPE_INTEGER, description='Ranked participants'),
+                    'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                    'participant': openapi.Schema(type=openapi.TYPE_OBJECT, description='Place of the participant'),
+                }
+            ),
+        },
+        tags=['competition']
+    )
+    def get_leaderboard(self, request, *args, **kwargs):
+        size = request.GET.get('size', '10')
+        participant_id = request.GET.get('participant')
+        if not size.isdigit() or not 0 < int(size) <= 100:
+            return Response(data={'error': _('size must be an integer between 1 and 100')},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if participant_id is not None and not participant_id.isdigit():
+            return Response(data={'error': _('participant must be integer')}, status=status.HTTP_400_BAD_REQUEST)
+        comp = Competition.objects.filter(id=kwargs['pk']).only('id', 'status').first()
         if comp is None:
             return Response(data={'error': _('Comp not found')}, status=status.HTTP_404_NOT_FOUND)
-        serializer = GetCompSerializer(comp, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        if comp.status != 2:
+            return Response(data={'error': _('This comp is not finished')}, status=status.HTTP_400_BAD_REQUEST)
+        top, count = get_top(comp.id, 0, int(size))
+        ranks = {participant: (rank, grade) for rank, (participant, grade) in enumerate(top)}
+        place = None
+        if participant_id is not None:
+            place = get_rank(comp.id, int(participant_id))
+            if place is not None:
+                ranks[int(participant_id)] = place
+        participants = Participant.objects.select_related('child').in_bulk(ranks)
+        context = {'request': request, 'ranks': ranks}
+        data = {
+            'count': count,
+            'results': LeaderboardSerializer([participants[participant] for participant, grade in top
+                                              if participant in participants], many=True, context=context).data,
+            'participant': None,
+        }
+        if place is not None and int(participant_id) in participants:
+            data['participant'] = LeaderboardSerializer(participants[int(participant_id)], context=context).data
+        return Response(data=data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         operation_description="Get Gallery By Id",
@@ -266,17 +564,37 @@ class MyCompetitionViewSet(ViewSet):
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
-        operation_description="Get Grade History",
+        operation_description="Get grades grouped by child and competition",
         operation_summary="Get Grade History",
+        manual_parameters=[
+            openapi.Parameter(
+                'cursor', openapi.IN_QUERY,
+                description="Cursor from the next/previous link",
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY,
+                description="Number of items per page (e.g., ?page_size=20)",
+                type=openapi.TYPE_INTEGER
+            ),
+        ],
         responses={
-            200: AssessmentHistorySerializer(),
+            200: GradeHistorySerializer(many=True),
         },
         tags=['competition']
     )
     def get_grade_history(self, request, *args, **kwargs):
-        grades = Assessment.objects.filter(participant__child__user=request.user)
-        serializer = AssessmentHistorySerializer(grades, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        # One page of child/competition groups, with every grade of the page loaded by a single prefetch.
+        participants = only_language(
+            Participant.objects.filter(child__user=request.user)
+            .filter(Exists(Assessment.objects.filter(participant=OuterRef('pk'))))
+            .select_related('child', 'competition')
+            .prefetch_related(Prefetch('assessment_set', queryset=Assessment.objects.order_by('-id'))),
+            get_request_language(request), model=Competition, prefix='competition__')
+        paginator = CustomCursorPagination()
+        page = paginator.paginate_queryset(participants, request, view=self)
+        serializer = GradeHistorySerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
     @swagger_auto_schema(
         operation_description="Get Grade By Id For Comp",
@@ -296,18 +614,65 @@ class MyCompetitionViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Get Notifications For Comp",
         operation_summary="Get Notifications For Comp",
+        manual_parameters=[
+            openapi.Parameter(
+                'cursor', openapi.IN_QUERY,
+                description="Cursor from the next/previous link",
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY,
+                description="Number of items per page (e.g., ?page_size=20)",
+                type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'is_read', openapi.IN_QUERY,
+                description="Only read (true) or unread (false) notifications",
+                type=openapi.TYPE_BOOLEAN
+            ),
+            openapi.Parameter(
+                'history', openapi.IN_QUERY,
+                description="List archived notifications instead of the inbox",
+                type=openapi.TYPE_BOOLEAN
+            ),
+        ],
         responses={
-            200: NotificationSerializer(),
+            200: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'unread_count': openapi.Schema(type=openapi.TYPE_INTEGER, description='Unread notifications'),
+                    'next': openapi.Schema(type=openapi.TYPE_STRING, nullable=True, description='Next page URL'),
+                    'previous': openapi.Schema(type=openapi.TYPE_STRING, nullable=True,
+                                               description='Previous page URL'),
+                    'results': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_OBJECT))
+                }
+            ),
         },
         tags=['competition']
     )
     def get_notifications(self, request, *args, **kwargs):
-        user = User.objects.filter(id=request.user.id).first()
-        if user is None:
+        user = request.user
+        if not user.is_authenticated:
             return Response(data={'error': _('User not found')}, status=status.HTTP_404_NOT_FOUND)
-        notifications = Notification.objects.filter(user=user)
-        serializer = NotificationSerializer(notifications, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        is_read = request.GET.get('is_read')
+        if is_read and is_read not in ('true', 'false'):
+            return Response(data={'error': _('is_read must be true or false')}, status=status.HTTP_400_BAD_REQUEST)
+        paginator = InboxCursorPagination()
+        position, limit = paginator.decode_cursor(request), paginator.get_page_size(request)
+        if request.GET.get('history') == 'true':
+            rows, next_position = get_history(user, position=position, limit=limit)
+            last_read_id = None
+        else:
+            rows, next_position, last_read_id = get_inbox(user, position=position, limit=limit,
+                                                          is_read=None if not is_read else is_read == 'true')
+        context = {'request': request, 'last_read_id': last_read_id}
+        data = [
+            NotificationSerializer(item, context=context).data if kind == PERSONAL
+            else BroadcastNotificationSerializer(item, context=context).data
+            for kind, item in rows
+        ]
+        return paginator.get_paginated_response(request, data, next_position,
+                                                unread_count=count_unread(user, last_read_id))
 
     @swagger_auto_schema(
         operation_description="Get Notification By Id For Comp",
@@ -318,14 +683,65 @@ class MyCompetitionViewSet(ViewSet):
         tags=['competition']
     )
     def get_notification_by_id(self, request, *args, **kwargs):
-        notification = Notification.objects.filter(id=kwargs['pk']).first()
+        notification = Notification.objects.filter(id=kwargs['pk'], user_id=request.user.id).first()
         if notification is None:
-            return Response(data={'error': _('Notification not found')}, status=status.HTTP_404_NOT_FOUND)
-        notification.is_read = True
-        notification.save(update_fields=['is_read'])
+            notification = ArchivedNotification.objects.filter(id=kwargs['pk'], user_id=request.user.id).first()
+            if notification is None:
+                return Response(data={'error': _('Notification not found')}, status=status.HTTP_404_NOT_FOUND)
+        else:
+            buffer_read_receipt(notification)
         serializer = NotificationSerializer(notification, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
+    @swagger_auto_schema(
+        operation_description="Mark personal notifications as read by id list, or every notification created up to "
+                              "`before`. Broadcasts share one read position per user, so only `before` marks them.",
+        operation_summary="Mark Notifications Read",
+        request_body=MarkNotificationsReadSerializer,
+        responses={
+            200: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'updated': openapi.Schema(type=openapi.TYPE_INTEGER, description='Notifications marked read'),
+                    'unread_count': openapi.Schema(type=openapi.TYPE_INTEGER, description='Unread notifications'),
+                }
+            ),
+        },
+        tags=['competition']
+    )
+    def mark_read(self, request, *args, **kwargs):
+        serializer = MarkNotificationsReadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(data=serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        user = request.user
+        updated = mark_notifications_read(user, ids=serializer.validated_data.get('ids'),
+                                          before=serializer.validated_data.get('before'))
+        user.refresh_from_db(fields=['unread_notifications_count'])
+        return Response(data={'updated': updated, 'unread_count': count_unread(user)},
+                        status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_description="Get a one-time ticket for the notification stream. Open "
+                              "notifications/stream/?ticket=<ticket> within the ticket lifetime.",
+        operation_summary="Notification Stream Ticket",
+        responses={
+            201: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'ticket': openapi.Schema(type=openapi.TYPE_STRING, description='ticket'),
+                    'expires_in': openapi.Schema(type=openapi.TYPE_INTEGER, description='Seconds the ticket is valid'),
+                }
+            ),
+        },
+        tags=['competition']
+    )
+    def stream_ticket(self, request, *args, **kwargs):
+        user = request.user
+        if not user.is_authenticated:
+            return Response(data={'error': _('User not found')}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data={'ticket': issue_stream_ticket(user), 'expires_in': STREAM_TICKET_TTL},
+                        status=status.HTTP_201_CREATED)
+
 
 class ContactUsViewSet(ViewSet):
     @swagger_auto_schema(
@@ -350,6 +766,39 @@ class ContactUsViewSet(ViewSet):
 
 
 class DynamicInfoViewSet(ViewSet):
+    @swagger_auto_schema(
+        operation_description="Get all site content in one response",
+        operation_summary="Get site content bundle",
+        responses={
+            200: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'version': openapi.Schema(type=openapi.TYPE_STRING, description='Content version'),
+                    'policy': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                    'about_us': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                    'about_result': openapi.Schema(type=openapi.TYPE_ARRAY,
+                                                   items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                    'contact_info': openapi.Schema(type=openapi.TYPE_ARRAY,
+                                                   items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                    'social_media': openapi.Schema(type=openapi.TYPE_ARRAY,
+                                                   items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                    'result_images': openapi.Schema(type=openapi.TYPE_ARRAY,
+                                                    items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                }
+            ),
+            304: 'Not Modified',
+        },
+        tags=['competition']
+    )
+    def get_site_content(self, request, *args, **kwargs):
+        data = {}
+        versions = []
+        for section in CONTENT_SERIALIZERS:
+            data[section], section_version = get_content_section(section, request)
+            versions.append(section_version)
+        data['version'] = combine_versions(versions)
+        return versioned_response(request, data, data['version'])
+
     @swagger_auto_schema(
         operation_description="Get all Result Image",
         operation_summary="Get all Result Image",
@@ -359,9 +808,8 @@ class DynamicInfoViewSet(ViewSet):
         tags=['competition']
     )
     def get_web_result_image(self, request, *args, **kwargs):
-        web_res = ResultImage.objects.all()
-        serializer = ResultImageSerializer(web_res, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        data, version = get_content_section('result_images', request)
+        return versioned_response(request, data, version)
 
     @swagger_auto_schema(
         operation_description="Get all Policy",
@@ -372,9 +820,8 @@ class DynamicInfoViewSet(ViewSet):
         tags=['competition']
     )
     def get_all_policy(self, request, *args, **kwargs):
-        policy = Policy.objects.all()
-        serializer = PolicySerializer(policy, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        data, version = get_content_section('policy', request)
+        return versioned_response(request, data, version)
 
     @swagger_auto_schema(
         operation_description="Get all About Us",
@@ -385,9 +832,8 @@ class DynamicInfoViewSet(ViewSet):
         tags=['competition']
     )
     def get_all_about_us(self, request, *args, **kwargs):
-        about_us = AboutUs.objects.all()
-        serializer = AboutUsSerializer(about_us, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        data, version = get_content_section('about_us', request)
+        return versioned_response(request, data, version)
 
     @swagger_auto_schema(
         operation_description="Get all About Result",
@@ -398,9 +844,8 @@ class DynamicInfoViewSet(ViewSet):
         tags=['competition']
     )
     def get_all_about_result(self, request, *args, **kwargs):
-        about_result = AboutResult.objects.all()
-        serializer = AboutResultSerializer(about_result, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        data, version = get_content_section('about_result', request)
+        return versioned_response(request, data, version)
 
     @swagger_auto_schema(
         operation_description="Get all Contact Info",
@@ -411,9 +856,8 @@ class DynamicInfoViewSet(ViewSet):
         tags=['competition']
     )
     def get_all_contact_info(self, request, *args, **kwargs):
-        contact_info = ContactInformation.objects.all()
-        serializer = ContactInformationSerializer(contact_info, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        data, version = get_content_section('contact_info', request)
+        return versioned_response(request, data, version)
 
     @swagger_auto_schema(
         operation_description="Get all Social Media",
@@ -424,9 +868,8 @@ class DynamicInfoViewSet(ViewSet):
         tags=['competition']
     )
     def get_all_social_media(self, request, *args, **kwargs):
-        social_media = SocialMedia.objects.all()
-        serializer = WebSocialMediaSerializer(social_media, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        data, version = get_content_section('social_media', request)
+        return versioned_response(request, data, version)
 
 
 class SubscriptionViewSet(ViewSet):
@@ -525,3 +968,46 @@ class ForTestViewSet(ViewSet):
             return Response(data={'error': 'Competition is not finished'}, status=status.HTTP_400_BAD_REQUEST)
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
+
+STREAM_KEEPALIVE = 15
+
+
+def get_stream_user(request):
+    # Browsers' EventSource cannot send headers, so they pass a one-time ?ticket= instead.
+    ticket = request.GET.get('ticket')
+    if ticket:
+        return redeem_stream_ticket(ticket)
+    parts = request.headers.get('Authorization', '').split()
+    if len(parts) != 2 or parts[0] != 'Bearer':
+        return None
+    raw_token = parts[1]
+    if BlacklistedAccessToken.objects.filter(token=raw_token).exists():
+        return None
+    authentication = JWTAuthentication()
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+async def notification_events(user):
+    yield f'retry: {STREAM_KEEPALIVE * 1000}\n\n'
+    async for message in subscribe([user_channel(user.id), BROADCAST_CHANNEL], keepalive=STREAM_KEEPALIVE):
+        if message is None:
+            yield ': keepalive\n\n'
+            continue
+        payload = json.loads(message)
+        if payload['kind'] == BROADCAST and not await sync_to_async(is_broadcast_visible)(user, payload['id']):
+            continue
+        yield f'event: notification\nid: {payload["kind"]}-{payload["id"]}\ndata: {message}\n\n'
+
+
+async def notification_stream(request):
+    """Server-Sent Events stream of new notifications for the logged in user."""
+    user = await sync_to_async(get_stream_user)(request)
+    if user is None:
+        return JsonResponse(data={'error': _('unauthorized')}, status=401)
+    response = StreamingHttpResponse(notification_events(user), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -9,9 +9,15 @@ from .models import (
     ContactInformation,
     SocialMedia,
     WebCertificate, SubscriptionModel,
+    ImageDerivative,
+    SiteStatistics,
+    BroadcastNotification,
+    BroadcastReadCursor,
+    ArchivedNotification,
 )
 
 admin.site.register(Notification)
+admin.site.register(ArchivedNotification)
 admin.site.register(Winner)
 admin.site.register(WebCertificate)
 #dynamic
@@ -22,3 +28,7 @@ admin.site.register(AboutResult)
 admin.site.register(ContactInformation)
 admin.site.register(SocialMedia)
 admin.site.register(SubscriptionModel)
+admin.site.register(ImageDerivative)
+admin.site.register(SiteStatistics)
+admin.site.register(BroadcastNotification)
+admin.site.register(BroadcastReadCursor)
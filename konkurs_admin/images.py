@@ -0,0 +1,174 @@
+import os
+from io import BytesIO
+
+from PIL import Image, UnidentifiedImageError
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from authentication.models import User
+from konkurs.models import Competition, ChildWork
+from .models import (
+    ImageDerivative,
+    ResultImage,
+    AboutUs,
+    AboutResult,
+    ContactInformation,
+    SocialMedia,
+    WebCertificate,
+)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tif', '.tiff')
+
+IMAGE_FIELDS = {
+    Competition: ['image'],
+    ChildWork: ['files'],
+    ResultImage: ['image'],
+    AboutUs: ['founder_image', 'co_founder_image'],
+    AboutResult: ['image'],
+    ContactInformation: ['image'],
+    SocialMedia: ['image'],
+    WebCertificate: ['image'],
+    User: ['image'],
+}
+
+DERIVATIVE_FORMATS = (
+    ('webp', 'WEBP'),
+    ('jpeg', 'JPEG'),
+)
+
+
+def is_image(name):
+    return bool(name) and name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def derivative_name(name, width, extension):
+    stem = os.path.splitext(name)[0]
+    return f'derivatives/{stem}_{width}.{extension}'
+
+
+def render_derivatives(name):
+    # Runs without touching the database so it can be used from worker processes.
+    if not is_image(name) or not default_storage.exists(name):
+        return {}
+    try:
+        with default_storage.open(name, 'rb') as f:
+            original = Image.open(f)
+            original.load()
+    except (UnidentifiedImageError, OSError):
+        return {}
+
+    if original.mode not in ('RGB', 'RGBA'):
+        original = original.convert('RGBA' if 'transparency' in original.info else 'RGB')
+
+    variants = {}
+    for width in settings.IMAGE_DERIVATIVE_WIDTHS:
+        if width >= original.width and variants:
+            break
+        image = original.copy()
+        image.thumbnail((width, original.height), Image.LANCZOS)
+        for extension, image_format in DERIVATIVE_FORMATS:
+            frame = image.convert('RGB') if image_format == 'JPEG' else image
+            buffer = BytesIO()
+            frame.save(buffer, format=image_format, quality=settings.IMAGE_DERIVATIVE_QUALITY)
+            path = derivative_name(name, width, extension)
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            default_storage.save(path, ContentFile(buffer.getvalue()))
+            variants.setdefault(extension, {})[str(image.width)] = path
+    return variants
+
+
+def get_owned_images(instances):
+    # Maps every image file of the instances to the (model label, pk) it belongs to.
+    images = {}
+    for instance in instances:
+        for field in IMAGE_FIELDS[type(instance)]:
+            value = getattr(instance, field)
+            if value and is_image(value.name):
+                images.setdefault(value.name, (instance._meta.label, instance.pk))
+    return images
+
+
+def save_derivatives(name, variants, owner='', owner_id=None):
+    ImageDerivative.objects.update_or_create(source=name, defaults={'variants': variants, 'owner': owner})
+    if not owner:
+        return
+    # The owning row now renders a srcset, so its conditional GET validators must change.
+    model = apps.get_model(owner)
+    if owner_id is not None:
+        rows = model.objects.filter(pk=owner_id)
+    else:
+        condition = Q()
+        for field in IMAGE_FIELDS[model]:
+            condition |= Q(**{field: name})
+        rows = model.objects.filter(condition)
+    rows.update(updated_at=timezone.now())
+
+
+class SrcsetField(serializers.Field):
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        variants = self.get_variants(value.name)
+        if not variants:
+            return None
+        request = self.context.get('request')
+        srcset = {}
+        for extension, paths in variants.items():
+            srcset[extension] = ', '.join(
+                f'{self.build_url(request, path)} {width}w'
+                for width, path in sorted(paths.items(), key=lambda item: int(item[0]))
+            )
+        return srcset
+
+    def build_url(self, request, path):
+        url = default_storage.url(path)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+    def get_variants(self, name):
+        loaded = self.context.setdefault('image_derivatives', {})
+        if name not in loaded:
+            names = self.sibling_names()
+            names.add(name)
+            found = dict(ImageDerivative.objects.filter(source__in=names).values_list('source', 'variants'))
+            for source in names:
+                loaded[source] = found.get(source, {})
+        return loaded[name]
+
+    def sibling_names(self):
+        # Load derivatives for the whole list in one query instead of one per row.
+        list_serializer = getattr(self.parent, 'parent', None)
+        if not isinstance(list_serializer, serializers.ListSerializer) or list_serializer.instance is None:
+            return set()
+        names = set()
+        for instance in list_serializer.instance:
+            try:
+                value = self.get_attribute(instance)
+            except (AttributeError, KeyError):
+                continue
+            if value:
+                names.add(value.name)
+        return names
+
+
+class ThumbnailField(SrcsetField):
+    def to_representation(self, value):
+        if not value:
+            return None
+        request = self.context.get('request')
+        variants = self.get_variants(value.name)
+        paths = variants.get('webp') or variants.get('jpeg')
+        if not paths:
+            return self.build_url(request, value.name)
+        return self.build_url(request, paths[min(paths, key=int)])
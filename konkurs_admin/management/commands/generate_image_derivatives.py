@@ -0,0 +1,39 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from konkurs_admin.images import IMAGE_FIELDS, is_image, render_derivatives, save_derivatives
+from konkurs_admin.models import ImageDerivative
+
+
+class Command(BaseCommand):
+    help = 'Generate resized and WebP derivatives for existing uploaded images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Number of worker processes')
+        parser.add_argument('--force', action='store_true', help='Regenerate existing derivatives')
+
+    def handle(self, *args, **options):
+        owners = {}
+        for model, fields in IMAGE_FIELDS.items():
+            for field in fields:
+                queryset = model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                for pk, name in queryset.values_list('pk', field).iterator():
+                    if is_image(name):
+                        owners.setdefault(name, (model._meta.label, pk))
+        names = set(owners)
+        if not options['force']:
+            names -= set(ImageDerivative.objects.values_list('source', flat=True))
+
+        self.stdout.write(f'Generating derivatives for {len(names)} images')
+        # Worker processes only render files, so database connections must not be shared with them.
+        connections.close_all()
+        generated = 0
+        names = sorted(names)
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            for name, variants in zip(names, executor.map(render_derivatives, names, chunksize=16)):
+                if variants:
+                    save_derivatives(name, variants, *owners[name])
+                    generated += 1
+        self.stdout.write(self.style.SUCCESS(f'Generated derivatives for {generated} images'))
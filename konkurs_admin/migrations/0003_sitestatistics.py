@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-18 20:02
+
+from django.db import migrations, models
+
+
+def count_statistics(apps, schema_editor):
+    SiteStatistics = apps.get_model('konkurs_admin', 'SiteStatistics')
+    Winner = apps.get_model('konkurs_admin', 'Winner')
+    Participant = apps.get_model('konkurs', 'Participant')
+    ChildWork = apps.get_model('konkurs', 'ChildWork')
+    SiteStatistics.objects.update_or_create(id=1, defaults={
+        'participants': Participant.objects.count(),
+        'winners': Winner.objects.filter(place=1).count(),
+        'awards': Winner.objects.count(),
+        'creative_works': ChildWork.objects.count(),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('konkurs', '0003_publishedwork'),
+        ('konkurs_admin', '0002_imagederivative'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('participants', models.IntegerField(default=0)),
+                ('winners', models.IntegerField(default=0)),
+                ('awards', models.IntegerField(default=0)),
+                ('creative_works', models.IntegerField(default=0)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(count_statistics, migrations.RunPython.noop),
+    ]
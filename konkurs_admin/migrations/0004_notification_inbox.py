@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-18 20:14
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def count_unread_notifications(apps, schema_editor):
+    User = apps.get_model('authentication', 'User')
+    users = User.objects.annotate(
+        unread=Count('notification', filter=Q(notification__is_read=False)),
+    ).filter(unread__gt=0)
+    for user in users.iterator():
+        user.unread_notifications_count = user.unread
+        user.save(update_fields=['unread_notifications_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0004_user_unread_notifications_count'),
+        ('konkurs_admin', '0003_sitestatistics'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'is_read', 'created_at'], name='konkurs_adm_user_id_a831d5_idx'),
+        ),
+        migrations.RunPython(count_unread_notifications, migrations.RunPython.noop),
+    ]
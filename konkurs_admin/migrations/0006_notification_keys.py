@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 20:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('child', '0001_initial'),
+        ('konkurs', '0007_competition_events'),
+        ('konkurs_admin', '0005_broadcast_notifications'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='broadcastnotification',
+            name='key',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='key',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('key__isnull', False)), fields=('key', 'user'), name='unique_notification_key'),
+        ),
+    ]
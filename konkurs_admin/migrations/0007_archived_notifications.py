@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-18 20:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('child', '0001_initial'),
+        ('konkurs', '0007_competition_events'),
+        ('konkurs_admin', '0006_notification_keys'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedNotification',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('grade', models.IntegerField(default=0)),
+                ('comment', models.TextField(blank=True)),
+                ('message', models.TextField(blank=True)),
+                ('is_read', models.BooleanField(default=True)),
+                ('key', models.CharField(blank=True, max_length=100, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('child', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='child.child')),
+                ('competition', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='konkurs.competition')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'created_at'], name='konkurs_adm_user_id_b33f5d_idx')],
+            },
+        ),
+    ]
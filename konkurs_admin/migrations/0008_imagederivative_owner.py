@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('konkurs_admin', '0007_archived_notifications'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagederivative',
+            name='owner',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 20:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('konkurs_admin', '0008_imagederivative_owner'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='broadcastreadcursor',
+            name='first_visible_id',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2 on 2026-10-18 20:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('child', '0001_initial'),
+        ('konkurs', '0008_participant_lease'),
+        ('konkurs_admin', '0009_broadcast_first_visible'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='archivednotification',
+            index=models.Index(condition=models.Q(('key__isnull', False)), fields=['key', 'user'], name='archived_notification_key_idx'),
+        ),
+    ]
@@ -15,6 +15,12 @@ PLACE = (
     (3, 'Third Place')
 )
 
+AUDIENCE = (
+    (1, 'All Candidates'),
+    (2, 'Competition Subscribers'),
+    (3, 'Competition Participants'),
+)
+
 RESULT_IMAGE = (
     (0, '---'),
     (1, 'Participants'),
@@ -33,11 +39,74 @@ class Notification(BaseModel):
     comment = models.TextField(blank=True)
     message = models.TextField(blank=True)
     is_read = models.BooleanField(default=False)
+    # Identifies the event a notification was sent for, so repeated deliveries are dropped.
+    key = models.CharField(max_length=100, blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'is_read', 'created_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['key', 'user'], condition=models.Q(key__isnull=False),
+                                    name='unique_notification_key'),
+        ]
 
     def __str__(self):
         return f'{self.user}'
 
 
+class ArchivedNotification(models.Model):
+    # Read notifications past the retention period; ids and timestamps are kept from the hot table.
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True,
+                             related_name='archived_notifications')
+    child = models.ForeignKey(Child, on_delete=models.CASCADE, blank=True, null=True, related_name='+')
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, blank=True, null=True, related_name='+')
+    grade = models.IntegerField(default=0)
+    comment = models.TextField(blank=True)
+    message = models.TextField(blank=True)
+    is_read = models.BooleanField(default=True)
+    key = models.CharField(max_length=100, blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['key', 'user'], condition=models.Q(key__isnull=False),
+                         name='archived_notification_key_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user}'
+
+
+class BroadcastNotification(BaseModel):
+    audience = models.IntegerField(choices=AUDIENCE, default=1)
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, blank=True, null=True)
+    message = models.TextField(blank=True)
+    key = models.CharField(max_length=100, blank=True, null=True, unique=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['audience', 'competition', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.get_audience_display()}: {self.message[:50]}'
+
+
+class BroadcastReadCursor(BaseModel):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='broadcast_cursor')
+    last_read_id = models.PositiveBigIntegerField(default=0)
+    # Broadcasts up to this id were sent before the user registered and are not shown to them.
+    first_visible_id = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.user}: {self.last_read_id}'
+
+
 class Winner(BaseModel):
     competition = models.ForeignKey(Competition, on_delete=models.CASCADE, blank=True, null=True)
     place = models.IntegerField(choices=PLACE, default=0)
@@ -127,5 +196,21 @@ class SubscriptionModel(BaseModel):
         return f'{self.user.first_name} {self.user.last_name}'
 
 
+class ImageDerivative(BaseModel):
+    source = models.CharField(max_length=255, unique=True)
+    variants = models.JSONField(default=dict, blank=True)
+    # Label of the model the image was uploaded to, e.g. "konkurs.Competition".
+    owner = models.CharField(max_length=100, blank=True, default='')
+
+    def __str__(self):
+        return f'{self.source}'
+
 
+class SiteStatistics(BaseModel):
+    participants = models.IntegerField(default=0)
+    winners = models.IntegerField(default=0)
+    awards = models.IntegerField(default=0)
+    creative_works = models.IntegerField(default=0)
 
+    def __str__(self):
+        return f'{self.updated_at}'
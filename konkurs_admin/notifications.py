@@ -0,0 +1,325 @@
+import secrets
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Q, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from redis import RedisError
+
+from authentication.models import User
+from base.pubsub import publish, publish_many
+from base.redis import get_redis
+from konkurs.models import Participant
+from .models import (
+    Notification,
+    ArchivedNotification,
+    BroadcastNotification,
+    BroadcastReadCursor,
+    SubscriptionModel,
+)
+
+READ_RECEIPTS_KEY = 'notifications:read_receipts'
+
+ALL_CANDIDATES = 1
+SUBSCRIBERS = 2
+PARTICIPANTS = 3
+
+PERSONAL = 'personal'
+BROADCAST = 'broadcast'
+KIND_RANKS = {PERSONAL: 0, BROADCAST: 1}
+
+BROADCAST_CHANNEL = 'notifications:broadcast'
+
+# Seconds a notification stream ticket can be redeemed for.
+STREAM_TICKET_TTL = 30
+
+ARCHIVED_FIELDS = ['id', 'user_id', 'child_id', 'competition_id', 'grade', 'comment', 'message', 'is_read', 'key',
+                   'created_at', 'updated_at']
+
+
+def update_unread_counts(counts):
+    # Users with the same delta share one UPDATE, so a fan-out costs a handful of queries.
+    users_by_delta = defaultdict(list)
+    for user_id, delta in counts.items():
+        if user_id is not None and delta:
+            users_by_delta[delta].append(user_id)
+    for delta, user_ids in users_by_delta.items():
+        User.objects.filter(id__in=user_ids).update(
+            unread_notifications_count=Greatest(F('unread_notifications_count') + delta, 0)
+        )
+
+
+def create_notifications(notifications, batch_size=1000):
+    keyed = [n for n in notifications if n.key]
+    if keyed:
+        # Deliveries that already happened are skipped before insert, so the unread counters stay exact.
+        # Archived rows are checked too, since the unique (key, user) constraint only covers the hot table.
+        delivered = set()
+        for model in (Notification, ArchivedNotification):
+            delivered.update(model.objects.filter(
+                key__in={n.key for n in keyed}, user_id__in={n.user_id for n in keyed}
+            ).values_list('key', 'user_id'))
+        pending = []
+        for notification in notifications:
+            if notification.key:
+                if (notification.key, notification.user_id) in delivered:
+                    continue
+                delivered.add((notification.key, notification.user_id))
+            pending.append(notification)
+        notifications = pending
+    if not notifications:
+        return []
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                created = Notification.objects.bulk_create(notifications, batch_size=batch_size)
+        except IntegrityError:
+            if not keyed:
+                raise
+            # A concurrent delivery of the same keys won the race; the nightly recount absorbs the overlap.
+            created = Notification.objects.bulk_create(notifications, batch_size=batch_size, ignore_conflicts=True)
+        update_unread_counts(Counter(n.user_id for n in created if not n.is_read))
+        transaction.on_commit(lambda: publish_notifications(created))
+    return created
+
+
+def notify(**fields):
+    return create_notifications([Notification(**fields)])[0]
+
+
+def mark_notification_read(notification):
+    if notification.is_read:
+        return False
+    with transaction.atomic():
+        updated = Notification.objects.filter(id=notification.id, is_read=False).update(is_read=True)
+        if updated:
+            update_unread_counts({notification.user_id: -1})
+    notification.is_read = True
+    return bool(updated)
+
+
+def mark_notifications_read(user, ids=None, before=None):
+    notifications = Notification.objects.filter(user=user, is_read=False)
+    if ids is not None:
+        notifications = notifications.filter(id__in=ids)
+    if before is not None:
+        notifications = notifications.filter(created_at__lte=before)
+    with transaction.atomic():
+        updated = notifications.update(is_read=True)
+        update_unread_counts({user.id: -updated})
+    if before is not None:
+        latest_id = visible_broadcasts(user).filter(created_at__lte=before).aggregate(Max('id'))['id__max']
+        if latest_id:
+            updated += advance_broadcast_cursor(user, latest_id)
+    return updated
+
+
+def broadcast(audience, message, competition_id=None, key=None):
+    # One row per event; recipients are resolved when they read their inbox.
+    fields = {'audience': audience, 'competition_id': competition_id, 'message': message}
+    if key is None:
+        notification, created = BroadcastNotification.objects.create(**fields), True
+    else:
+        notification, created = BroadcastNotification.objects.get_or_create(key=key, defaults=fields)
+    if created:
+        transaction.on_commit(lambda: publish(BROADCAST_CHANNEL, broadcast_payload(notification)))
+    return notification
+
+
+def user_channel(user_id):
+    return f'notifications:user:{user_id}'
+
+
+def notification_payload(notification):
+    # Same shape as NotificationSerializer, so pushed and fetched messages look alike to clients.
+    return {
+        'id': notification.id,
+        'kind': PERSONAL,
+        'child': notification.child_id,
+        'competition': notification.competition_id,
+        'grade': notification.grade,
+        'comment': notification.comment,
+        'message': notification.message,
+        'is_read': notification.is_read,
+        'created_at': notification.created_at,
+    }
+
+
+def broadcast_payload(notification):
+    return {
+        'id': notification.id,
+        'kind': BROADCAST,
+        'competition': notification.competition_id,
+        'message': notification.message,
+        'is_read': False,
+        'created_at': notification.created_at,
+    }
+
+
+def issue_stream_ticket(user):
+    # EventSource cannot send headers; a short-lived ticket keeps the access token out of the stream URL.
+    ticket = secrets.token_urlsafe(32)
+    cache.set(f'notifications:stream_ticket:{ticket}', user.id, STREAM_TICKET_TTL)
+    return ticket
+
+
+def redeem_stream_ticket(ticket):
+    key = f'notifications:stream_ticket:{ticket}'
+    user_id = cache.get(key)
+    # Only the request whose delete removed the ticket may use it, so a ticket works once.
+    if user_id is None or not cache.delete(key):
+        return None
+    return User.objects.filter(id=user_id, is_active=True).first()
+
+
+def publish_notifications(notifications):
+    # Rows inserted with ignore_conflicts have no id; their users will see them on the next inbox fetch.
+    publish_many([
+        (user_channel(notification.user_id), notification_payload(notification))
+        for notification in notifications if notification.pk and notification.user_id
+    ])
+
+
+def is_broadcast_visible(user, broadcast_id):
+    return visible_broadcasts(user).filter(id=broadcast_id).exists()
+
+
+def visible_broadcasts(user):
+    condition = (
+        Q(audience=SUBSCRIBERS, competition__in=SubscriptionModel.objects.filter(user=user).values('competition'))
+        | Q(audience=PARTICIPANTS, competition__in=Participant.objects.filter(child__user=user).values('competition'))
+    )
+    if user.role == 1:
+        condition |= Q(audience=ALL_CANDIDATES)
+    first_visible_id = Coalesce(Subquery(
+        BroadcastReadCursor.objects.filter(user=user).values('first_visible_id')[:1]), 0)
+    return BroadcastNotification.objects.filter(condition, id__gt=first_visible_id)
+
+
+def start_broadcast_cursor(user):
+    # New users only see broadcasts sent after they registered.
+    latest_id = BroadcastNotification.objects.aggregate(Max('id'))['id__max'] or 0
+    BroadcastReadCursor.objects.get_or_create(
+        user=user, defaults={'last_read_id': latest_id, 'first_visible_id': latest_id})
+
+
+def get_broadcast_read_id(user):
+    return BroadcastReadCursor.objects.filter(user=user).values_list('last_read_id', flat=True).first() or 0
+
+
+def advance_broadcast_cursor(user, last_read_id):
+    previous_id = get_broadcast_read_id(user)
+    if last_read_id <= previous_id:
+        return 0
+    BroadcastReadCursor.objects.update_or_create(user=user, defaults={'last_read_id': last_read_id})
+    return visible_broadcasts(user).filter(id__gt=previous_id, id__lte=last_read_id).count()
+
+
+def count_unread(user, last_read_id=None):
+    if last_read_id is None:
+        last_read_id = get_broadcast_read_id(user)
+    return user.unread_notifications_count + visible_broadcasts(user).filter(id__gt=last_read_id).count()
+
+
+def after_position(kind, position):
+    # Rows that come after the cursor in (-created_at, -kind rank, -id) order.
+    created_at, rank, item_id = position
+    own_rank = KIND_RANKS[kind]
+    condition = Q(created_at__lt=created_at)
+    if own_rank == rank:
+        condition |= Q(created_at=created_at, id__lt=item_id)
+    elif own_rank < rank:
+        condition |= Q(created_at=created_at)
+    return condition
+
+
+def get_inbox(user, position=None, limit=20, is_read=None):
+    last_read_id = get_broadcast_read_id(user)
+    personal = Notification.objects.filter(user=user)
+    broadcasts = visible_broadcasts(user)
+    if is_read is not None:
+        personal = personal.filter(is_read=is_read)
+        broadcasts = broadcasts.filter(id__lte=last_read_id) if is_read else broadcasts.filter(id__gt=last_read_id)
+    if position is not None:
+        personal = personal.filter(after_position(PERSONAL, position))
+        broadcasts = broadcasts.filter(after_position(BROADCAST, position))
+    # Each source is read with its own keyset query and the two pages are merged here.
+    rows = [(PERSONAL, item) for item in personal.order_by('-created_at', '-id')[:limit + 1]]
+    rows += [(BROADCAST, item) for item in broadcasts.order_by('-created_at', '-id')[:limit + 1]]
+    rows.sort(key=lambda row: (row[1].created_at, KIND_RANKS[row[0]], row[1].id), reverse=True)
+    next_position = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        kind, item = rows[-1]
+        next_position = (item.created_at, KIND_RANKS[kind], item.id)
+    return rows, next_position, last_read_id
+
+
+def get_history(user, position=None, limit=20):
+    archived = ArchivedNotification.objects.filter(user=user)
+    if position is not None:
+        archived = archived.filter(after_position(PERSONAL, position))
+    rows = [(PERSONAL, item) for item in archived.order_by('-created_at', '-id')[:limit + 1]]
+    next_position = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_position = (rows[-1][1].created_at, KIND_RANKS[PERSONAL], rows[-1][1].id)
+    return rows, next_position
+
+
+def archive_notifications(batch_size=1000):
+    # Only read rows move, so unread counters and the hot inbox index are unaffected.
+    cutoff = timezone.now() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+    expired = Notification.objects.filter(is_read=True, created_at__lt=cutoff).order_by('id')
+    archived = 0
+    while True:
+        with transaction.atomic():
+            rows = list(expired.select_for_update(skip_locked=True).values(*ARCHIVED_FIELDS)[:batch_size])
+            if not rows:
+                return archived
+            ArchivedNotification.objects.bulk_create([ArchivedNotification(**row) for row in rows],
+                                                     ignore_conflicts=True)
+            Notification.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        archived += len(rows)
+
+
+def buffer_read_receipt(notification):
+    # Opening a notification only records the receipt; flush_read_receipts() writes them in batches.
+    if notification.is_read:
+        return
+    try:
+        get_redis().sadd(READ_RECEIPTS_KEY, notification.id)
+    except RedisError:
+        mark_notification_read(notification)
+        return
+    notification.is_read = True
+
+
+def flush_read_receipts(batch_size=1000):
+    flushed = 0
+    while True:
+        ids = [int(value) for value in get_redis().spop(READ_RECEIPTS_KEY, batch_size)]
+        if not ids:
+            return flushed
+        with transaction.atomic():
+            unread = dict(Notification.objects.select_for_update().filter(id__in=ids, is_read=False)
+                          .values_list('id', 'user_id'))
+            Notification.objects.filter(id__in=unread).update(is_read=True)
+            update_unread_counts({user_id: -count for user_id, count in Counter(unread.values()).items()})
+        flushed += len(unread)
+
+
+def recount_unread_notifications(batch_size=1000):
+    users = User.objects.annotate(
+        actual_unread=Count('notification', filter=Q(notification__is_read=False))
+    ).exclude(unread_notifications_count=F('actual_unread')).only('id', 'unread_notifications_count')
+    changed = []
+    for user in users.iterator(chunk_size=batch_size):
+        user.unread_notifications_count = user.actual_unread
+        changed.append(user)
+    User.objects.bulk_update(changed, ['unread_notifications_count'], batch_size=batch_size)
+    return len(changed)
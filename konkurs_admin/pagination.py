@@ -1,5 +1,11 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 class CustomPagination(PageNumberPagination):
     page_size = 10  # Default number of items per page
@@ -14,4 +20,55 @@ class CustomPagination(PageNumberPagination):
             'previous': self.get_previous_link(),
             'current_page': self.page.number,
             'results': data
-        })
\ No newline at end of file
+        })
+
+class CustomCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-id'
+
+
+class InboxCursorPagination:
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size < 1:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            created_at, rank, item_id = json.loads(urlsafe_b64decode(encoded.encode()).decode())
+            position = (parse_datetime(created_at), int(rank), int(item_id))
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound('Invalid cursor')
+        if position[0] is None:
+            raise NotFound('Invalid cursor')
+        return position
+
+    def encode_cursor(self, position):
+        created_at, rank, item_id = position
+        return urlsafe_b64encode(json.dumps([created_at.isoformat(), rank, item_id]).encode()).decode()
+
+    def get_paginated_response(self, request, data, next_position, **extra):
+        next_link = None
+        if next_position is not None:
+            next_link = replace_query_param(request.build_absolute_uri(), self.cursor_query_param,
+                                            self.encode_cursor(next_position))
+        return Response({
+            **extra,
+            'next': next_link,
+            'previous': None,
+            'results': data
+        })
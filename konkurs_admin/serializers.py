@@ -1,5 +1,4 @@
 from datetime import date
-from django.conf import settings
 from rest_framework import serializers
 from authentication.validators import (
     validate_uz_phone_number,
@@ -24,6 +23,8 @@ from authentication.models import (
 )
 from django.contrib.auth.hashers import make_password
 
+from base.serializers import TranslatedModelSerializer
+
 from payment.models import PurchaseModel
 from .models import (
     Winner,
@@ -43,22 +44,17 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'name_uz', 'name_ru', 'name_en']
 
 
-class GetCategorySerializer(serializers.ModelSerializer):
+class GetCategorySerializer(TranslatedModelSerializer):
+    translated_fields = ('name',)
+
     class Meta:
         model = Category
         fields = ['id', 'name']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['name'] = getattr(instance, f'name_{lang}')
-        return data
 
+class GetCompetitionSerializer(TranslatedModelSerializer):
+    translated_fields = ('name', 'description')
 
-class GetCompetitionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Competition
         fields = ['id', 'name', 'category', 'description', 'application_start_date', 'application_start_time',
@@ -66,15 +62,8 @@ class GetCompetitionSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
         data['status'] = dict(STATUS).get(instance.status, 'Unknown')
-        data['category'] = instance.category.name
-        if lang in lang_options:
-            data['name'] = getattr(instance, f'name_{lang}')
-            data['category'] = getattr(instance.category, f'name_{lang}')
-            data['description'] = getattr(instance, f'description_{lang}')
+        data['category'] = getattr(instance.category, f'name_{self.get_language()}')
         return data
 
 
@@ -189,24 +178,15 @@ class JurySerializer(serializers.ModelSerializer):
         return data
 
 
-class GetJurySerializer(serializers.ModelSerializer):
+class GetJurySerializer(TranslatedModelSerializer):
+    translated_fields = ('place_of_work', 'speciality')
+
     class Meta:
         model = User
         fields = ['id', 'first_name', 'last_name', 'middle_name', 'phone_number', 'birth_date',
                   'place_of_work', 'academic_degree',
                   'speciality']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        # data['academic_degree'] = dict(ACADEMIC_DEGREE).get(instance.academic_degree, 'Unknown')
-        if lang in lang_options:
-            data['place_of_work'] = getattr(instance, f'place_of_work_{lang}')
-            data['speciality'] = getattr(instance.category, f'speciality_{lang}')
-        return data
-
 
 class GradeCriteriaSerializer(serializers.ModelSerializer):
     class Meta:
@@ -253,10 +233,11 @@ class StatusParticipantSerializer(serializers.ModelSerializer):
     works = serializers.SerializerMethodField(source='get_works')
     grade = serializers.SerializerMethodField(source='get_grade')
     comment = serializers.SerializerMethodField(source='get_comment')
+    juries = serializers.SerializerMethodField(source='get_juries')
 
     class Meta:
         model = Participant
-        fields = ['id', 'full_name', 'date_of_birth', 'age', 'study_place', 'works', 'grade', 'comment']
+        fields = ['id', 'full_name', 'date_of_birth', 'age', 'study_place', 'works', 'grade', 'juries', 'comment']
 
     def get_works(self, obj):
         works_instance = ChildWork.objects.filter(
@@ -268,6 +249,9 @@ class StatusParticipantSerializer(serializers.ModelSerializer):
         return None
 
     def get_grade(self, obj):
+        score = getattr(obj, 'score', None)
+        if score is not None and score.trimmed_mean is not None:
+            return round(score.trimmed_mean, 2)
         grade_instance = Assessment.objects.filter(
             participant__id=obj.id, participant__competition__id=obj.competition.id
         ).first()
@@ -275,6 +259,10 @@ class StatusParticipantSerializer(serializers.ModelSerializer):
             return grade_instance.grade
         return None
 
+    def get_juries(self, obj):
+        score = getattr(obj, 'score', None)
+        return score.juries if score is not None else 0
+
     def get_comment(self, obj):
         grade_instance = Assessment.objects.filter(
             participant__id=obj.id, participant__competition__id=obj.competition.id
@@ -367,70 +355,38 @@ class RegisterParticipantSerializer(serializers.ModelSerializer):
         return data
 
 
-class PolicySerializer(serializers.ModelSerializer):
+class PolicySerializer(TranslatedModelSerializer):
+    translated_fields = ('description',)
+
     class Meta:
         model = Policy
         fields = ['id', 'description']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['description'] = getattr(instance, f'description_{lang}')
-        return data
 
+class AboutUsSerializer(TranslatedModelSerializer):
+    translated_fields = ('title', 'sub_title', 'description', 'founder_position', 'co_founder_position')
 
-class AboutUsSerializer(serializers.ModelSerializer):
     class Meta:
         model = AboutUs
         fields = ['id', 'title', 'sub_title', 'description', 'founder_name', 'founder_position', 'founder_image',
                   'co_founder_name', 'co_founder_position', 'co_founder_image']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['title'] = getattr(instance, f'title_{lang}')
-            data['sub_title'] = getattr(instance, f'sub_title_{lang}')
-            data['description'] = getattr(instance, f'description_{lang}')
-            data['founder_position'] = getattr(instance, f'founder_position_{lang}')
-            data['co_founder_position'] = getattr(instance, f'co_founder_position_{lang}')
-        return data
 
+class AboutResultSerializer(TranslatedModelSerializer):
+    translated_fields = ('description',)
 
-class AboutResultSerializer(serializers.ModelSerializer):
     class Meta:
         model = AboutResult
         fields = ['id', 'description', 'image']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['description'] = getattr(instance, f'description_{lang}')
-        return data
 
+class ContactInformationSerializer(TranslatedModelSerializer):
+    translated_fields = ('location',)
 
-class ContactInformationSerializer(serializers.ModelSerializer):
     class Meta:
         model = ContactInformation
         fields = ['id', 'location', 'phone_number', 'email', 'image']
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['location'] = getattr(instance, f'location_{lang}')
-        return data
-
 
 class WebSocialMediaSerializer(serializers.ModelSerializer):
     class Meta:
@@ -652,7 +608,7 @@ class DownloadCertificateSerializer(serializers.ModelSerializer):
         fields = ['certificate']
 
 
-class PurchaseInfoSerializer(serializers.ModelSerializer):
+class PurchaseInfoSerializer(TranslatedModelSerializer):
     class Meta:
         model = PurchaseModel
         fields = ['competition', 'participant', 'price']
@@ -660,11 +616,5 @@ class PurchaseInfoSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         data = super().to_representation(instance)
         data['participant'] = f'{instance.participant.child.first_name} {instance.participant.child.last_name}'
-        request = self.context.get('request')
-        lang = request.headers.get('Accept-Language', settings.MODELTRANSLATION_DEFAULT_LANGUAGE)
-        lang_options = settings.MODELTRANSLATION_LANGUAGES
-        if lang in lang_options:
-            data['competition'] = getattr(instance.competition, f'name_{lang}')
-        else:
-            data['competition'] = instance.competition.name
+        data['competition'] = getattr(instance.competition, f'name_{self.get_language()}')
         return data
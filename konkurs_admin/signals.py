@@ -1,6 +1,12 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
-from .models import Winner, Notification
+from authentication.models import User
+from konkurs.models import Participant, ChildWork
+from .models import Winner
+from .notifications import notify, start_broadcast_cursor
+from .images import IMAGE_FIELDS
+from .statistics import update_statistics
+from .tasks import enqueue_image_derivatives
 from django.utils.translation import gettext_lazy  as _
 
 
@@ -12,4 +18,60 @@ def post_save_for_winner(sender, instance, created, **kwargs):
     )
     instance.participant.winner = True
     instance.participant.save()
-    Notification.objects.create(child=instance.participant.child, competition=instance.competition, message=message)
\ No newline at end of file
+    notify(user=instance.participant.child.user, child=instance.participant.child, competition=instance.competition,
+           message=message)
+
+
+@receiver(post_save, sender=User)
+def post_save_user_for_broadcasts(sender, instance, created, **kwargs):
+    if created:
+        start_broadcast_cursor(instance)
+
+
+def post_save_for_image(sender, instance, **kwargs):
+    enqueue_image_derivatives([instance])
+
+
+for model in IMAGE_FIELDS:
+    post_save.connect(post_save_for_image, sender=model, dispatch_uid=f'image_derivatives_{model._meta.label}')
+
+
+@receiver(post_save, sender=Participant)
+def post_save_participant_statistics(sender, instance, created, **kwargs):
+    if created:
+        update_statistics(participants=1)
+
+
+@receiver(post_delete, sender=Participant)
+def post_delete_participant_statistics(sender, instance, **kwargs):
+    update_statistics(participants=-1)
+
+
+@receiver(post_save, sender=ChildWork)
+def post_save_child_work_statistics(sender, instance, created, **kwargs):
+    if created:
+        update_statistics(creative_works=1)
+
+
+@receiver(post_delete, sender=ChildWork)
+def post_delete_child_work_statistics(sender, instance, **kwargs):
+    update_statistics(creative_works=-1)
+
+
+@receiver(pre_save, sender=Winner)
+def pre_save_winner_statistics(sender, instance, **kwargs):
+    instance.previous_place = None
+    if instance.pk:
+        instance.previous_place = Winner.objects.filter(pk=instance.pk).values_list('place', flat=True).first()
+
+
+@receiver(post_save, sender=Winner)
+def post_save_winner_statistics(sender, instance, created, **kwargs):
+    was_first = getattr(instance, 'previous_place', None) == 1
+    is_first = instance.place == 1
+    update_statistics(awards=1 if created else 0, winners=int(is_first) - int(was_first))
+
+
+@receiver(post_delete, sender=Winner)
+def post_delete_winner_statistics(sender, instance, **kwargs):
+    update_statistics(awards=-1, winners=-1 if instance.place == 1 else 0)
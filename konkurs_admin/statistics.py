@@ -0,0 +1,36 @@
+from django.db.models import F
+
+from konkurs.models import Participant, ChildWork
+from .models import SiteStatistics, Winner
+
+STATISTICS_ID = 1
+
+
+def update_statistics(**deltas):
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not changes:
+        return
+    updated = SiteStatistics.objects.filter(id=STATISTICS_ID).update(**changes)
+    if not updated:
+        reconcile_statistics()
+
+
+def count_statistics():
+    return {
+        'participants': Participant.objects.count(),
+        'winners': Winner.objects.filter(place=1).count(),
+        'awards': Winner.objects.count(),
+        'creative_works': ChildWork.objects.count(),
+    }
+
+
+def reconcile_statistics():
+    statistics, _ = SiteStatistics.objects.update_or_create(id=STATISTICS_ID, defaults=count_statistics())
+    return statistics
+
+
+def get_statistics():
+    statistics = SiteStatistics.objects.filter(id=STATISTICS_ID).first()
+    if statistics is None:
+        statistics = reconcile_statistics()
+    return statistics
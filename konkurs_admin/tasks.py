@@ -1,123 +1,121 @@
 from celery import shared_task
 from django.utils.timezone import now
-from datetime import timedelta
-from konkurs_admin.models import Notification, SubscriptionModel
-from authentication.models import User
-from konkurs.models import Competition
+from django.db import transaction
+from konkurs_admin.models import ImageDerivative, Notification
+from konkurs.models import (
+    COMPETITION_ENDS_SOON,
+    COMPETITION_STARTS_SOON,
+    REGISTRATION_ENDED,
+    REGISTRATION_ENDS_SOON,
+    REGISTRATION_STARTED,
+    REGISTRATION_STARTS_SOON,
+    CompetitionEvent,
+    Participant,
+)
+from .images import get_owned_images, render_derivatives, save_derivatives
+from .notifications import (
+    SUBSCRIBERS,
+    broadcast,
+    create_notifications,
+    archive_notifications,
+    recount_unread_notifications,
+    flush_read_receipts,
+)
+from .statistics import reconcile_statistics
 from django.utils.translation import gettext_lazy  as _
 
 
+@shared_task(name='celery_tasks.tasks.generate_image_derivatives')
+def generate_image_derivatives(name, owner='', owner_id=None):
+    variants = render_derivatives(name)
+    if variants:
+        save_derivatives(name, variants, owner, owner_id)
+    return len(variants)
+
+
+@shared_task(name='celery_tasks.tasks.reconcile_site_statistics')
+def reconcile_site_statistics():
+    reconcile_statistics()
+    return 'Success'
+
+
+@shared_task(name='celery_tasks.tasks.flush_notification_read_receipts')
+def flush_notification_read_receipts():
+    return flush_read_receipts()
+
+
+@shared_task(name='celery_tasks.tasks.reconcile_unread_notifications')
+def reconcile_unread_notifications():
+    # Cascade deletes remove notifications without going through the counter helpers.
+    return recount_unread_notifications()
+
+
+@shared_task(name='celery_tasks.tasks.archive_old_notifications')
+def archive_old_notifications():
+    return archive_notifications()
+
+
+@shared_task(bind=True, name='celery_tasks.tasks.notify_competition_participants')
+def notify_competition_participants(self, competition_id, message, batch_size=1000):
+    # Streams the participants in chunks so memory stays flat however large the competition is.
+    recipients = Participant.objects.filter(competition_id=competition_id, child__user__isnull=False)
+    total = recipients.count()
+    sent = 0
+    batch = []
+    for child_id, user_id in recipients.values_list('child_id', 'child__user_id').iterator(chunk_size=batch_size):
+        batch.append(Notification(user_id=user_id, child_id=child_id, competition_id=competition_id,
+                                  message=message, key=f'competition-finished:{competition_id}:{child_id}'))
+        if len(batch) >= batch_size:
+            # Rows a retried run already delivered are skipped by create_notifications, so only new ones count.
+            sent += len(create_notifications(batch, batch_size=batch_size))
+            batch = []
+            self.update_state(state='PROGRESS', meta={'sent': sent, 'total': total})
+    sent += len(create_notifications(batch, batch_size=batch_size))
+    return {'sent': sent, 'total': total}
+
+
+def enqueue_image_derivatives(instances):
+    images = get_owned_images(instances)
+    if not images:
+        return
+    existing = set(ImageDerivative.objects.filter(source__in=images).values_list('source', flat=True))
+    for name in set(images) - existing:
+        owner, owner_id = images[name]
+        transaction.on_commit(lambda name=name, owner=owner, owner_id=owner_id: generate_image_derivatives.delay(
+            name, owner, owner_id))
+
+
 @shared_task(name='celery_tasks.tasks.send_notification_to_all_users')
-def send_notification_to_all_users(competition, message):
-    # users = User.objects.filter(role=1)  # Get all users
-    users = SubscriptionModel.objects.filter(user__role=1)
+def send_notification_to_all_users(competition_id, message, key=None):
+    # Subscribers are resolved when they read their inbox, and the key makes retries a no-op.
+    broadcast(SUBSCRIBERS, message, competition_id=competition_id, key=key)
 
-    notifications = [
-        Notification(user=sub.user, competition=competition, message=message)
-        for sub in users
-    ]
 
-    Notification.objects.bulk_create(notifications)
+EVENT_MESSAGES = {
+    REGISTRATION_STARTS_SOON: _("Registration for %(name)s will start in 3 days!"),
+    REGISTRATION_STARTED: _("Registration for %(app_name)s has started!"),
+    REGISTRATION_ENDS_SOON: _("Registration for %(app_name)s ends in 3 days!"),
+    REGISTRATION_ENDED: _("Registration for %(app_name)s ended. Good luck in Competition!"),
+    COMPETITION_STARTS_SOON: _("%(name)s competition will start in 3 days!"),
+    COMPETITION_ENDS_SOON: _("%(comp_name)s competition ends in 3 days!. HURRY!!!"),
+}
 
 
 @shared_task(name='celery_tasks.tasks.check_competition_notifications')
 def check_competition_notifications():
-    current_time = now()
-
-    ### For register ###
-    # 3 days before starting register
-    app_start_in_3 = Competition.objects.filter(
-        application_start_date=current_time.date() + timedelta(days=3),
-        application_start_time__hour=current_time.hour,
-        application_start_time__minute=current_time.minute
-    )
-    for app in app_start_in_3:
-        send_notification_to_all_users.delay(
-            app,
-            _("Registration for %(name)s will start in 3 days!") % {'name': app.name}
-        )
-
-    # 🔹 Check if Registration Starts Now (Matching Date & Time)
-    app_starting = Competition.objects.filter(
-        application_start_date=current_time.date(),
-        application_start_time__hour=current_time.hour,
-        application_start_time__minute=current_time.minute
-    )
-    for app in app_starting:
-        send_notification_to_all_users(
-            app,
-            _("Registration for %(app_name)s has started!") % {'app_name': app.name}
-        )
-
-    # # 🔹 Check if Registration Ends in 3 Days (Matching Date)
-    app_end_in_3 = Competition.objects.filter(
-        application_end_date=current_time.date() + timedelta(days=3),
-        application_end_time__hour=current_time.hour,
-        application_end_time__minute=current_time.minute
-    )
-    for app in app_end_in_3:
-        send_notification_to_all_users(
-            app,
-            _("Registration for %(app_name)s ends in 3 days!") % {'app_name': app.name}
-        )
-
-    # # end register date
-    app_end = Competition.objects.filter(
-        application_end_date=current_time.date(),
-        application_end_time__hour=current_time.hour,
-        application_end_time__minute=current_time.minute
-    )
-    for app in app_end:
-        send_notification_to_all_users(
-            app,
-            _("Registration for %(app_name)s ended. Good luck in Competition!") % {'app_name': app.name}
-        )
-
-    # ### For comp ###
-    # 3 days before starting comp
-    competition_start_in_3 = Competition.objects.filter(
-        comp_start_date=current_time.date() + timedelta(days=3),
-        comp_start_time__hour=current_time.hour,
-        comp_start_time__minute=current_time.minute
-    )
-    for competition in competition_start_in_3:
-        send_notification_to_all_users(
-            competition,
-            _("%(name)s competition will start in 3 days!") % {'name': competition.name}
-        )
-
-    # # 🔹 Check if Comp Starts Now (Matching Date & Time)
-    # competitions_starting = Competition.objects.filter(
-    #     comp_start_date=current_time.date(),
-    #     comp_start_time__hour=current_time.hour,
-    #     comp_start_time__minute=current_time.minute
-    # )
-    # for competition in competitions_starting:
-    #     send_notification_to_all_users(
-    #         competition,
-    #         f"{competition.name} competition has started!. Look at it!"
-    #     )
-
-    # # 🔹 Check if Comp Ends in 3 Days (Matching Date)
-    competitions_end_in_3 = Competition.objects.filter(
-        comp_end_date=current_time.date() + timedelta(days=3),
-        application_end_time__hour=current_time.hour,
-        application_end_time__minute=current_time.minute
-    )
-    for competition in competitions_end_in_3:
-        send_notification_to_all_users(
-            competition,
-            _("%(comp_name)s competition ends in 3 days!. HURRY!!!") % {'comp_name': competition.name}
-        )
-
-    # end comp date
-    # competitions_ending = Competition.objects.filter(
-    #     comp_end_date=current_time.date(),
-    #     comp_end_time__hour=current_time.hour,
-    #     comp_end_time__minute=current_time.minute
-    # )
-    # for competition in competitions_ending:
-    #     send_notification_to_all_users(
-    #         competition,
-    #         f"{competition.name} competition ended. Good luck!"
-    #     )
\ No newline at end of file
+    # Everything due since the last run is picked up, so missed ticks are caught up.
+    due = CompetitionEvent.objects.filter(fired=False, fire_at__lte=now()).select_related('competition')
+    fired = 0
+    for event in due.order_by('fire_at').iterator():
+        with transaction.atomic():
+            # Claiming the row first keeps overlapping runs from sending the same event twice.
+            if not CompetitionEvent.objects.filter(id=event.id, fired=False).update(fired=True):
+                continue
+            name = event.competition.name
+            message = EVENT_MESSAGES[event.event_type] % {'name': name, 'app_name': name, 'comp_name': name}
+            # The schedule is part of the key, so a reminder re-armed by a date change is sent again.
+            key = f'competition-event:{event.id}:{event.fire_at.isoformat()}'
+            args = (event.competition_id, str(message), key)
+            transaction.on_commit(lambda args=args: send_notification_to_all_users.delay(*args))
+        fired += 1
+    return fired
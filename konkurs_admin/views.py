@@ -1,10 +1,7 @@
-from django.db import transaction
-from django.db.models import Q, Max
+from django.db.models import Q
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models.functions import Coalesce
-from django.db.models import Value
 
 from konkurs.models import (
     Competition,
@@ -65,6 +62,13 @@ from konkurs.serializers import (
     ContactUsSerializer
 )
 from konkurs.models import ContactUs
+from konkurs.search import search_competitions
+from jury.leaderboard import RankedParticipants, ranked_scores
+from konkurs.utils import (
+    publish_participant_works,
+    unpublish_participant_works,
+)
+from .notifications import create_notifications, notify
 from .pagination import CustomPagination
 from django.utils.translation import gettext_lazy as _
 
@@ -319,7 +323,7 @@ class CompetitionViewSet(ViewSet):
             return Response(data={'error': _('page size must be greater than 0 or must be integer')},
                             status=status.HTTP_400_BAD_REQUEST)
         search = request.GET.get('search', '')
-        comp = Competition.objects.filter(name__icontains=search)
+        comp = search_competitions(Competition.objects.select_related('category'), search)
         paginator = self.pagination_class()
         paginated_competitions = paginator.paginate_queryset(comp, request)
         serializer = GetCompetitionSerializer(paginated_competitions, many=True, context={'request': request})
@@ -527,10 +531,8 @@ class CompetitionViewSet(ViewSet):
             return Response(data={'error': _('Competition not found')}, status=status.HTTP_400_BAD_REQUEST)
         if comp.status != 2:
             return Response(data={'error': _('This comp is not finished')}, status=status.HTTP_400_BAD_REQUEST)
-        participants = Participant.objects.filter(
-            competition=comp, action=2).annotate(grade=Max('assessment__grade')).annotate(
-            sort_grade=Coalesce('grade', Value(-1))
-        ).order_by('-sort_grade')
+        participants = RankedParticipants(comp.id, Participant.objects.filter(
+            competition=comp, action=2).select_related('score', 'competition', 'child'))
         paginator = self.pagination_class()
         paginated_participants = paginator.paginate_queryset(participants, request)
         serializer = StatusParticipantSerializer(paginated_participants, many=True, context={'request': request})
@@ -1060,6 +1062,7 @@ class CompetitionViewSet(ViewSet):
             return Response(data={'error': _('Comp is not active')}, status=status.HTTP_400_BAD_REQUEST)
         if action == 'accept':
             participant.action = 2
+            publish_participant_works(participant)
         elif action == 'decline':
             message = (
                 _("Dear %(participant_name)s.") % {'participant_name': participant.child.first_name},
@@ -1067,8 +1070,9 @@ class CompetitionViewSet(ViewSet):
                     'comp_name': participant.competition.name}
             )
             participant.action = 3
-            Notification.objects.create(user=participant.child.user, child=participant.child,
-                                        competition=participant.competition, message=message)
+            unpublish_participant_works(participant)
+            notify(user=participant.child.user, child=participant.child,
+                   competition=participant.competition, message=message)
         else:
             return Response(data={'error': _('Invalid action')}, status=status.HTTP_400_BAD_REQUEST)
         participant.save()
@@ -1123,10 +1127,8 @@ class CompetitionViewSet(ViewSet):
             return Response(data={'error': _('Competition not found')}, status=status.HTTP_400_BAD_REQUEST)
         if comp.status != 1:
             return Response(data={'error': _('Comp is not active')}, status=status.HTTP_400_BAD_REQUEST)
-        participants = Participant.objects.filter(
-            competition=comp, action=2).annotate(
-            grade=Max('assessment__grade')).annotate(sort_grade=Coalesce('grade', Value(-1))
-                                                     ).order_by('-sort_grade')
+        participants = RankedParticipants(comp.id, Participant.objects.filter(
+            competition=comp, action=2).select_related('score', 'competition', 'child'))
         paginator = self.pagination_class()
         paginated_participants = paginator.paginate_queryset(participants, request)
         serializer = StatusParticipantSerializer(paginated_participants, many=True, context={'request': request})
@@ -1430,9 +1432,9 @@ class CompetitionViewSet(ViewSet):
             return Response(data={'error': _('Competition not found')}, status=status.HTTP_400_BAD_REQUEST)
         if comp.status != 1:
             return Response(data={'error': _('Comp is not active')}, status=status.HTTP_400_BAD_REQUEST)
-        participants = Participant.objects.filter(competition=comp, winner=False, action=2).annotate(
-            grade=Max('assessment__grade')).annotate(sort_grade=Coalesce('grade', Value(-1))
-                                                     ).order_by('-sort_grade')
+        participants = RankedParticipants(comp.id, Participant.objects.filter(
+            competition=comp, winner=False, action=2).select_related('score', 'competition'),
+            scores=ranked_scores(comp.id).filter(participant__winner=False))
         paginator = self.pagination_class()
         paginated_participants = paginator.paginate_queryset(participants, request)
         serializer = StatusParticipantSerializer(paginated_participants, many=True, context={'request': request})
@@ -1475,8 +1477,7 @@ class CompetitionViewSet(ViewSet):
             return Response(data={'error': _('It has no any other participants to send notification')},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        with transaction.atomic():
-            Notification.objects.bulk_create(notifications)
+        create_notifications(notifications)
 
         return Response({"success": _("Thank you message sent to all participants")}, status=status.HTTP_201_CREATED)
 